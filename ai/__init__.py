@@ -2,10 +2,23 @@
 AI 관련 모듈
 """
 
-from .ai_summarizer import AISummarizer
-from .gemini_client import GeminiClient
-from .fallback_summarizer import FallbackSummarizer
-from .news_formatter import NewsFormatter
+import importlib
+
+# 실제 사용 시점에 하위 모듈을 import (PEP 562)
+_LAZY_EXPORTS = {
+    'AISummarizer': '.ai_summarizer',
+    'GeminiClient': '.gemini_client',
+    'FallbackSummarizer': '.fallback_summarizer',
+    'NewsFormatter': '.news_formatter',
+}
 
 __all__ = ['AISummarizer', 'GeminiClient', 'FallbackSummarizer', 'NewsFormatter']
 
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -2,105 +2,224 @@
 리팩토링된 AI 요약기 모듈
 모듈화된 구조로 재사용성과 유지보수성 향상
 """
+import asyncio
+import hashlib
+import heapq
 import logging
-from typing import List, Dict, Optional
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+from core import json_utils
+from core.stock_utils import get_like_count
 from .gemini_client import GeminiClient
 from .news_formatter import NewsFormatter
 from .fallback_summarizer import FallbackSummarizer
 
 logger = logging.getLogger(__name__)
 
+# 프롬프트에 넣을 뉴스 개수/길이 상한 (토큰 수와 요청 크기 제한)
+MAX_PROMPT_NEWS_ITEMS = 50
+MAX_PROMPT_NEWS_CHARS = 20000
+
+# 프롬프트 크기별 모델 선택: 짧은 입력은 더 빠르고 저렴한 Lite 모델로 처리
+SUMMARY_MODEL = 'gemini-2.5-flash'
+LITE_SUMMARY_MODEL = 'gemini-2.5-flash-lite'
+LITE_MODEL_MAX_PROMPT_CHARS = 8000
+
+# Gemini 호출 한 번에 기다리는 최대 시간 (초)
+GEMINI_REQUEST_TIMEOUT = 30
+
+# 같은 뉴스 묶음(+시장 데이터)에 대한 AI 요약 재사용 (개수/유효시간)
+SUMMARY_CACHE_MAX_ENTRIES = 128
+SUMMARY_CACHE_TTL = 300
+
 class AISummarizer:
     """모듈화된 AI 요약기 클래스"""
     
     def __init__(self, api_key: str):
         """AI 요약기를 초기화합니다."""
-        self.gemini_client = GeminiClient(api_key)
+        self.gemini_client = GeminiClient.get(api_key)
         self.news_formatter = NewsFormatter()
         self.fallback_summarizer = FallbackSummarizer()
+        # 입력 지문 -> (저장 시각, 요약) LRU 캐시
+        self._summary_cache = OrderedDict()
         
-        if not self.gemini_client.is_available():
-            logger.warning("Gemini AI 클라이언트가 사용 불가능합니다. 기본 요약 모드로 동작합니다.")
+        # Gemini 클라이언트는 첫 요약 요청 시 초기화되므로 여기서는 키 유무만 확인
+        if not api_key:
+            logger.warning("Gemini API 키가 없습니다. 기본 요약 모드로 동작합니다.")
     
-    async def summarize_news(self, news_list: List[Dict]) -> Optional[str]:
-        """뉴스 목록을 AI로 요약합니다."""
+    async def summarize_news(self, news_list: List[Dict], current_time: Optional[str] = None) -> Optional[str]:
+        """뉴스 목록을 AI로 요약합니다 (current_time은 프롬프트/기본 요약에 함께 쓰는 기준 시각)."""
         if not news_list:
             return None
         
+        # 기준 시각은 호출당 한 번만 계산해 프롬프트와 기본 요약에서 같은 값을 사용
+        if current_time is None:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+        
         if not self.gemini_client.is_available():
             logger.error("Gemini AI 모델이 초기화되지 않았습니다. 기본 요약을 생성합니다.")
-            return self.fallback_summarizer.create_fallback_summary(news_list)
+            return self.fallback_summarizer.create_fallback_summary(news_list, current_time)
+        
+        cache_key = self._make_cache_key('news', news_list)
+        cached = self._get_cached_summary(cache_key)
+        if cached:
+            logger.info("동일한 뉴스 목록의 AI 요약을 캐시에서 재사용합니다.")
+            return cached
         
         try:
             # 뉴스 데이터를 텍스트로 변환
-            news_text = self.news_formatter.format_news_for_ai(news_list)
+            news_text = self._format_news_text(news_list)
             
             # AI 프롬프트 생성
-            prompt = self.news_formatter.create_summary_prompt(news_text)
-            
-            # AI 요약 요청
-            response = self.gemini_client.generate_content(prompt)
+            prompt = self.news_formatter.create_summary_prompt(news_text, current_time)
             
-            if response:
-                # 응답에서 텍스트 추출
-                ai_summary = self.gemini_client.extract_text_from_response(response)
-                if ai_summary:
-                    logger.info(f"AI 요약 완료: {len(news_list)}개 뉴스 처리")
-                    return ai_summary
-                else:
-                    logger.warning("AI 응답에서 텍스트를 추출할 수 없습니다.")
-                    return self.fallback_summarizer.create_fallback_summary(news_list)
-            else:
-                logger.error("Gemini API 호출 실패")
-                return self.fallback_summarizer.create_fallback_summary(news_list)
-                
+            ai_summary = await self._request_summary(prompt)
         except Exception as e:
             logger.error(f"AI 요약 중 오류 발생: {e}")
-            return self.fallback_summarizer.create_fallback_summary(news_list)
+            ai_summary = None
+        
+        if ai_summary:
+            logger.info(f"AI 요약 완료: {len(news_list)}개 뉴스 처리")
+            self._store_cached_summary(cache_key, ai_summary)
+            return ai_summary
+        # 실패 경로는 모두 여기서 한 번만 기본 요약을 생성
+        return self.fallback_summarizer.create_fallback_summary(news_list, current_time)
     
-    async def summarize_news_with_market_data(self, news_list: List[Dict], market_data: Dict) -> Optional[str]:
-        """뉴스 목록과 시장 데이터를 AI로 요약합니다."""
+    async def summarize_news_with_market_data(self, news_list: List[Dict], market_data: Dict, current_time: Optional[str] = None) -> Optional[str]:
+        """뉴스 목록과 시장 데이터를 AI로 요약합니다 (current_time은 프롬프트/기본 요약에 함께 쓰는 기준 시각)."""
         if not news_list:
             return None
         
+        # 기준 시각은 호출당 한 번만 계산해 프롬프트와 기본 요약에서 같은 값을 사용
+        if current_time is None:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+        
         if not self.gemini_client.is_available():
             logger.error("Gemini AI 모델이 초기화되지 않았습니다. 기본 요약을 생성합니다.")
-            return self.fallback_summarizer.create_fallback_summary_with_market_data(news_list, market_data)
+            return self.fallback_summarizer.create_fallback_summary_with_market_data(news_list, market_data, current_time)
+        
+        cache_key = self._make_cache_key('market', news_list, market_data)
+        cached = self._get_cached_summary(cache_key)
+        if cached:
+            logger.info("동일한 뉴스/시장 데이터의 AI 요약을 캐시에서 재사용합니다.")
+            return cached
         
         try:
             # 뉴스 데이터를 텍스트로 변환
-            news_text = self.news_formatter.format_news_for_ai(news_list)
+            news_text = self._format_news_text(news_list)
             
             # 시장 데이터를 텍스트로 변환
             market_text = self.news_formatter.format_market_data_for_ai(market_data)
             
             # 향상된 요약 프롬프트 생성 (중복 방지 및 최신 뉴스 우선)
-            prompt = self.news_formatter.create_enhanced_summary_prompt(news_text, market_text)
-            
-            # AI 요약 요청
-            response = self.gemini_client.generate_content(prompt)
+            prompt = self.news_formatter.create_enhanced_summary_prompt(news_text, market_text, current_time)
             
-            if response:
-                # 응답에서 텍스트 추출
-                ai_summary = self.gemini_client.extract_text_from_response(response)
-                # 안전장치: 길이 제한 적용 (줄바꿈은 유지하여 가독성 향상)
-                if ai_summary:
-                    # 줄바꿈은 유지하되, 전체 길이만 제한
-                    if len(ai_summary) > 800:  # Discord 임베드에 맞게 800자로 제한
-                        ai_summary = ai_summary[:797] + "..."
-                if ai_summary:
-                    logger.info(f"AI 요약 완료: {len(news_list)}개 뉴스 + 시장 데이터 처리")
-                    return ai_summary
-                else:
-                    logger.warning("AI 응답에서 텍스트를 추출할 수 없습니다.")
-                    return self.fallback_summarizer.create_fallback_summary_with_market_data(news_list, market_data)
-            else:
-                logger.error("Gemini API 호출 실패")
-                return self.fallback_summarizer.create_fallback_summary_with_market_data(news_list, market_data)
-                
+            ai_summary = await self._request_summary(prompt)
+            if ai_summary:
+                # 안전장치: 앞뒤 공백만 정리하고 길이 제한 적용 (줄바꿈은 유지하여 가독성 향상)
+                ai_summary = ai_summary.strip()
+                if len(ai_summary) > 800:  # Discord 임베드에 맞게 800자로 제한
+                    ai_summary = ai_summary[:797] + "..."
         except Exception as e:
             logger.error(f"AI 요약 중 오류 발생: {e}")
-            return self.fallback_summarizer.create_fallback_summary_with_market_data(news_list, market_data)
+            ai_summary = None
+        
+        if ai_summary:
+            logger.info(f"AI 요약 완료: {len(news_list)}개 뉴스 + 시장 데이터 처리")
+            self._store_cached_summary(cache_key, ai_summary)
+            return ai_summary
+        # 실패 경로는 모두 여기서 한 번만 기본 요약을 생성
+        return self.fallback_summarizer.create_fallback_summary_with_market_data(news_list, market_data, current_time)
+    
+    def _format_news_text(self, news_list: List[Dict]) -> str:
+        """프롬프트에 넣을 뉴스 텍스트를 만듭니다."""
+        return self.news_formatter.format_news_for_ai(
+            self._select_news_for_prompt(news_list), MAX_PROMPT_NEWS_ITEMS, MAX_PROMPT_NEWS_CHARS
+        )
+    
+    @staticmethod
+    def _make_cache_key(kind: str, news_list: List[Dict], market_data: Optional[Dict] = None) -> bytes:
+        """뉴스 ID 집합과 시장 데이터 값으로 요약 캐시 키(지문)를 만듭니다.
+
+        뉴스 순서와 조회 시각(timestamp)은 요약 내용과 무관하므로 키에서 제외합니다.
+        """
+        news_ids = sorted(str(news.get('id')) for news in news_list)
+        market_values = None
+        if market_data:
+            market_values = {
+                name: {k: v for k, v in data.items() if k != 'timestamp'} if isinstance(data, dict) else data
+                for name, data in ((name, market_data.get(name)) for name in ('nasdaq', 'fear_greed'))
+            }
+        payload = [kind, news_ids, market_values]
+        return hashlib.blake2b(json_utils.dumps_bytes(payload), digest_size=16).digest()
+    
+    def _get_cached_summary(self, key: bytes) -> Optional[str]:
+        """유효시간 내의 캐시된 요약을 반환합니다 (없거나 만료되면 None)."""
+        entry = self._summary_cache.get(key)
+        if not entry:
+            return None
+        stored_at, summary = entry
+        if time.monotonic() - stored_at > SUMMARY_CACHE_TTL:
+            del self._summary_cache[key]
+            return None
+        self._summary_cache.move_to_end(key)
+        return summary
+    
+    def _store_cached_summary(self, key: bytes, summary: str):
+        """AI 요약을 캐시에 저장하고 상한을 넘으면 가장 오래 쓰지 않은 항목을 버립니다."""
+        self._summary_cache[key] = (time.monotonic(), summary)
+        self._summary_cache.move_to_end(key)
+        while len(self._summary_cache) > SUMMARY_CACHE_MAX_ENTRIES:
+            self._summary_cache.popitem(last=False)
+    
+    @staticmethod
+    def _choose_model(prompt: str) -> str:
+        """프롬프트 길이에 따라 사용할 모델을 고릅니다."""
+        return LITE_SUMMARY_MODEL if len(prompt) < LITE_MODEL_MAX_PROMPT_CHARS else SUMMARY_MODEL
+    
+    async def _request_summary(self, prompt: str) -> Optional[str]:
+        """Gemini에 요약을 요청하고 응답 텍스트를 반환합니다 (실패 시 None)."""
+        model_name = self._choose_model(prompt)
+        response = await self._generate_content(prompt, model_name)
+        if not response and model_name != SUMMARY_MODEL and self.gemini_client.api_type == 'new_client':
+            # Lite 모델이 실패하면 기본 모델로 한 번 더 시도 (기존 방식은 모델을 고를 수 없어 재시도하지 않음)
+            logger.warning(f"{model_name} 호출 실패, {SUMMARY_MODEL}로 재시도합니다.")
+            response = await self._generate_content(prompt, SUMMARY_MODEL)
+        if not response:
+            logger.error("Gemini API 호출 실패")
+            return None
+        
+        # 응답에서 텍스트 추출
+        ai_summary = self.gemini_client.extract_text_from_response(response)
+        if not ai_summary:
+            logger.warning("AI 응답에서 텍스트를 추출할 수 없습니다.")
+        return ai_summary
+    
+    async def _generate_content(self, prompt: str, model_name: str) -> Optional[object]:
+        """블로킹 SDK 호출을 이벤트 루프 밖에서 실행하고, 시간 초과 시 None을 반환합니다."""
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(self.gemini_client.generate_content, prompt, model_name),
+                timeout=GEMINI_REQUEST_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Gemini API 응답 시간 초과 ({GEMINI_REQUEST_TIMEOUT}초, 모델: {model_name})")
+            return None
+    
+    @staticmethod
+    def _select_news_for_prompt(news_list: List[Dict]) -> List[Dict]:
+        """뉴스가 상한보다 많으면 좋아요 수가 많은 순으로 상위 뉴스만 고릅니다."""
+        if len(news_list) <= MAX_PROMPT_NEWS_ITEMS:
+            return news_list
+        return heapq.nlargest(MAX_PROMPT_NEWS_ITEMS, news_list, key=get_like_count)
+    
+    async def summarize_batch(self, items: List[Tuple[List[Dict], Dict]]) -> List[Optional[str]]:
+        """여러 (뉴스 목록, 시장 데이터) 묶음을 동시에 요약합니다."""
+        return await asyncio.gather(
+            *(self.summarize_news_with_market_data(news_list, market_data) for news_list, market_data in items)
+        )
     
     def is_available(self) -> bool:
         """AI 서비스가 사용 가능한지 확인"""
@@ -2,45 +2,71 @@
 AI 실패 시 기본 요약 생성 모듈
 """
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-from core.stock_utils import sort_news_by_stock_priority, get_popular_tags, format_news_with_stock_info
+from core.stock_utils import top_news_by_stock_priority, get_popular_tags, format_news_with_stock_info, get_like_count
 
 logger = logging.getLogger(__name__)
 
+# 기본 요약 생성 자체가 실패했을 때 사용하는 메시지 템플릿
+_ERROR_SUMMARY_TEMPLATE = "📊 시장 동향 요약 (오류 발생)\n\n분석된 뉴스: %d개\nAI 분석 서비스가 일시적으로 불가능합니다."
+_ERROR_MARKET_SUMMARY_TEMPLATE = "시장 동향 요약 (오류 발생)\n분석된 뉴스: %d개\nAI 분석 서비스가 일시적으로 불가능합니다."
+# 뉴스가 하나도 없을 때 반환하는 고정 메시지 (템플릿 조립을 건너뜀)
+_EMPTY_SUMMARY = "📊 시장 동향 요약 (기본 요약)\n\n분석할 뉴스가 없습니다."
+_EMPTY_MARKET_SUMMARY = "시장 동향 (기본 요약)\n\n분석할 뉴스가 없습니다."
+
+# 기본 요약에 쓰는 상위 뉴스/태그 수 (두 기본 요약 중 큰 쪽 기준, 작은 쪽은 앞부분만 사용)
+FALLBACK_TOP_NEWS = 10
+FALLBACK_TOP_TAGS = 5
+
+def _prepare_report_features(news_list: List[Dict]) -> Tuple[List[Dict], List[Tuple[str, int]]]:
+    """기본 요약에 필요한 (우선순위 상위 뉴스, 인기 태그)를 한 번에 계산합니다.
+
+    두 기본 요약이 같은 뉴스 목록을 쓸 때 호출자가 한 번만 계산해 features로 넘길 수 있습니다.
+    """
+    return top_news_by_stock_priority(news_list, FALLBACK_TOP_NEWS), get_popular_tags(news_list, FALLBACK_TOP_TAGS)
+
 class FallbackSummarizer:
     """AI가 작동하지 않을 때 기본 요약을 생성하는 클래스"""
     
     @staticmethod
-    def create_fallback_summary(news_list: List[Dict]) -> str:
-        """AI가 작동하지 않을 때 기본 요약을 생성합니다."""
+    def create_fallback_summary(news_list: List[Dict], current_time: Optional[str] = None,
+                                features: Optional[Tuple[List[Dict], List[Tuple[str, int]]]] = None) -> str:
+        """AI가 작동하지 않을 때 기본 요약을 생성합니다 (current_time을 주지 않으면 현재 시각 사용).
+
+        features는 _prepare_report_features(news_list)의 결과이며, 주지 않으면 여기서 계산합니다.
+        """
+        if not news_list:
+            return _EMPTY_SUMMARY
         try:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-            summary = f"📊 **{current_time} 시장 동향 요약** (기본 요약)\n\n"
+            if current_time is None:
+                current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+            # 조각을 리스트에 모아 마지막에 한 번만 합치기
+            parts = [f"📊 **{current_time} 시장 동향 요약** (기본 요약)\n\n"]
             
             # 인기 뉴스 (유명한 주식 우선 + 좋아요/조회수 기준) 분석
-            popular_news = sort_news_by_stock_priority(news_list)[:5]
+            # 헤드라인에 필요한 상위 10개만 한 번 고르고 인기 뉴스(상위 5개)에도 재사용
+            sorted_news, top_tags = features or _prepare_report_features(news_list)
+            popular_news = sorted_news[:5]
             
-            summary += "🔥 **인기 뉴스 (트렌드 분석):**\n"
-            for i, news in enumerate(popular_news, 1):
-                title = news.get('title', '제목 없음')
-                author = news.get('author_name', 'Unknown')
-                like_count = news.get('like_stats', {}).get('like_count', 0)
-                view_count = news.get('view_count', 0)
-                summary += f"{i}. {title} (by {author}) 👍{like_count} 👁️{view_count}\n"
+            parts.append("🔥 **인기 뉴스 (트렌드 분석):**\n")
+            parts.extend(
+                f"{i}. {news.get('title', '제목 없음')} (by {news.get('author_name', 'Unknown')}) "
+                f"👍{get_like_count(news)} 👁️{news.get('view_count', 0)}\n"
+                for i, news in enumerate(popular_news, 1)
+            )
             
             # 태그 분석으로 트렌드 파악
-            top_tags = get_popular_tags(news_list, 5)
             if top_tags:
-                summary += f"\n🏷️ **인기 키워드/태그:**\n"
-                for tag, count in top_tags:
-                    summary += f"• {tag} ({count}회 언급)\n"
+                parts.append("\n🏷️ **인기 키워드/태그:**\n")
+                parts.extend(f"• {tag} ({count}회 언급)\n" for tag, count in top_tags)
             
-            summary += f"\n📰 **전체 뉴스 헤드라인 (유명한 주식 우선):**\n"
-            summary += format_news_with_stock_info(news_list, 10)
+            parts.append("\n📰 **전체 뉴스 헤드라인 (유명한 주식 우선):**\n")
+            parts.append(format_news_with_stock_info(sorted_news, 10, presorted=True))
             
-            summary += f"\n📈 **분석된 뉴스 수**: {len(news_list)}개\n"
-            summary += "⚠️ **참고**: AI 분석이 일시적으로 불가능하여 기본 요약을 제공합니다.\n"
+            parts.append(f"\n📈 **분석된 뉴스 수**: {len(news_list)}개\n")
+            parts.append("⚠️ **참고**: AI 분석이 일시적으로 불가능하여 기본 요약을 제공합니다.\n")
+            summary = "".join(parts)
             
             # Discord 필드 길이 제한 (1024자)
             if len(summary) > 1024:
@@ -50,49 +76,52 @@ class FallbackSummarizer:
             
         except Exception as e:
             logger.error(f"기본 요약 생성 중 오류: {e}")
-            return f"📊 시장 동향 요약 (오류 발생)\n\n분석된 뉴스: {len(news_list)}개\nAI 분석 서비스가 일시적으로 불가능합니다."
+            return _ERROR_SUMMARY_TEMPLATE % len(news_list)
     
     @staticmethod
-    def create_fallback_summary_with_market_data(news_list: List[Dict], market_data: Dict) -> str:
-        """AI가 작동하지 않을 때 시장 데이터를 포함한 간결한 기본 요약을 생성합니다."""
+    def create_fallback_summary_with_market_data(news_list: List[Dict], market_data: Dict, current_time: Optional[str] = None,
+                                                 features: Optional[Tuple[List[Dict], List[Tuple[str, int]]]] = None) -> str:
+        """AI가 작동하지 않을 때 시장 데이터를 포함한 간결한 기본 요약을 생성합니다 (current_time을 주지 않으면 현재 시각 사용).
+
+        features는 _prepare_report_features(news_list)의 결과이며, 주지 않으면 여기서 계산합니다.
+        """
+        if not news_list:
+            return _EMPTY_MARKET_SUMMARY
         try:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-            summary = f"{current_time} 시장 동향 (기본 요약)\n\n"
+            if current_time is None:
+                current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+            # 조각을 리스트에 모아 마지막에 한 번만 합치기
+            parts = [f"{current_time} 시장 동향 (기본 요약)\n\n"]
             
             # 시장 데이터 정보 추가 (간결하게)
             nasdaq = market_data.get('nasdaq', {})
             fear_greed = market_data.get('fear_greed', {})
             
-            summary += "시장 현황: "
+            parts.append("시장 현황: ")
             if nasdaq:
-                change_emoji = "📈" if nasdaq.get('change', 0) >= 0 else "📉"
-                summary += f"나스닥 {nasdaq.get('current_price', 'N/A')} ({nasdaq.get('change_percent', 'N/A')}%)"
+                parts.append(f"나스닥 {nasdaq.get('current_price', 'N/A')} ({nasdaq.get('change_percent', 'N/A')}%)")
             
             if fear_greed:
-                fg_value = fear_greed.get('value', 0)
-                fg_emoji = "😍" if fg_value >= 75 else "😊" if fg_value >= 55 else "😐" if fg_value >= 45 else "😰" if fg_value >= 25 else "😱"
-                summary += f", 공포탐욕지수 {fg_value} ({fear_greed.get('classification', 'N/A')})"
+                parts.append(f", 공포탐욕지수 {fear_greed.get('value', 0)} ({fear_greed.get('classification', 'N/A')})")
             
-            summary += "\n\n주요 이슈:\n"
+            parts.append("\n\n주요 이슈:\n")
             
-            # 인기 뉴스 분석 (간결하게)
-            popular_news = sort_news_by_stock_priority(news_list)[:3]
+            # 인기 뉴스 분석 (간결하게) - 공유 결과의 앞부분만 사용
+            sorted_news, top_tags = features or _prepare_report_features(news_list)
             
-            for i, news in enumerate(popular_news, 1):
+            for news in sorted_news[:3]:
                 title = news.get('title', '제목 없음')
                 if len(title) > 50:
                     title = title[:47] + "..."
-                like_count = news.get('like_stats', {}).get('like_count', 0)
-                summary += f"- {title} (👍{like_count})\n"
+                parts.append(f"- {title} (👍{get_like_count(news)})\n")
             
             # 태그 분석 (간결하게)
-            top_tags = get_popular_tags(news_list, 3)
             if top_tags:
-                summary += f"\n핵심 키워드: "
-                tag_list = [f"{tag}({count})" for tag, count in top_tags]
-                summary += ", ".join(tag_list)
+                parts.append("\n핵심 키워드: ")
+                parts.append(", ".join(f"{tag}({count})" for tag, count in top_tags[:3]))
             
-            summary += f"\n\n분석 뉴스: {len(news_list)}개"
+            parts.append(f"\n\n분석 뉴스: {len(news_list)}개")
+            summary = "".join(parts)
             
             # Discord 필드 길이 제한 (800자)
             if len(summary) > 800:
@@ -102,5 +131,5 @@ class FallbackSummarizer:
             
         except Exception as e:
             logger.error(f"기본 요약 생성 중 오류: {e}")
-            return f"시장 동향 요약 (오류 발생)\n분석된 뉴스: {len(news_list)}개\nAI 분석 서비스가 일시적으로 불가능합니다."
+            return _ERROR_MARKET_SUMMARY_TEMPLATE % len(news_list)
 
@@ -2,91 +2,149 @@
 Gemini AI 클라이언트 모듈
 다양한 Gemini API 버전을 지원하는 통합 클라이언트
 """
+import functools
 import logging
+import threading
 
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+# 기존 방식에서 순서대로 시도할 모델 이름
+LEGACY_MODEL_CANDIDATES = ('gemini-2.5-flash', 'gemini-2.5-pro', 'gemini-2.5-flash-lite')
+
+
+@functools.lru_cache(maxsize=None)
+def _build_generative_model(model_name: str):
+    """이름별 GenerativeModel을 한 번만 생성합니다 (실패는 캐시되지 않음)."""
+    import google.generativeai as genai
+    return genai.GenerativeModel(model_name)
+
+
+@functools.lru_cache(maxsize=None)
+def _import_new_genai():
+    """새 google genai 모듈을 반환합니다 (Client가 없으면 None). import는 한 번만 시도."""
+    try:
+        from google import genai
+    except ImportError:
+        return None
+    return genai if hasattr(genai, 'Client') else None
+
+
+# API 키별로 공유되는 클라이언트 인스턴스
+_CLIENT_CACHE: Dict[Optional[str], "GeminiClient"] = {}
+_CLIENT_CACHE_LOCK = threading.Lock()
+
 class GeminiClient:
     """다양한 Gemini API 버전을 지원하는 통합 클라이언트"""
     
+    # 초기화에 실패한 모델 이름 (모든 인스턴스가 공유)
+    _failed_models = set()
+    
     def __init__(self, api_key: str = None):
         self.client = None
         self.model = None
         self.api_type = None
         
-        # API 키가 있으면 설정
-        if api_key:
-            self._setup_client(api_key)
+        # google 라이브러리 import 비용이 크므로 실제 사용 시점까지 초기화를 미룸
+        self._api_key = api_key
+        self._setup_done = False
+        self._setup_lock = threading.Lock()
+        # 기존 방식(google-generativeai)에서 모델 탐색 전까지 보관하는 모듈
+        self._legacy_genai = None
+        # 모델명만 있는 구버전 경로에서 재사용하는 genai.Client
+        self._legacy_client = None
+    
+    @classmethod
+    def get(cls, api_key: str = None) -> "GeminiClient":
+        """API 키에 해당하는 공유 클라이언트를 반환합니다 (없으면 생성)."""
+        with _CLIENT_CACHE_LOCK:
+            client = _CLIENT_CACHE.get(api_key)
+            if client is None:
+                client = cls(api_key)
+                _CLIENT_CACHE[api_key] = client
+            return client
+    
+    def _ensure_setup(self):
+        """첫 사용 시점에 한 번만 클라이언트를 초기화합니다."""
+        if self._setup_done:
+            return
+        # generate_content가 여러 스레드에서 동시에 호출될 수 있으므로 잠금
+        with self._setup_lock:
+            if self._setup_done:
+                return
+            # API 키가 있으면 설정
+            if self._api_key:
+                self._setup_client(self._api_key)
+            self._setup_done = True
     
     def _setup_client(self, api_key: str):
         """클라이언트 초기화"""
         try:
             # 새로운 Google genai 클라이언트 방식 시도
-            from google import genai
+            genai = _import_new_genai()
             
-            if hasattr(genai, 'Client'):
+            if genai is not None:
                 self.client = genai.Client()
                 self.api_type = 'new_client'
                 logger.info("Google genai 클라이언트 초기화 성공")
             else:
-                # 기존 방식
-                import google.generativeai as genai
-                genai.configure(api_key=api_key)
+                # google-generativeai 라이브러리 방식 (모델은 첫 generate_content 호출 시 결정)
+                import google.generativeai as legacy_genai
+                legacy_genai.configure(api_key=api_key)
                 self.api_type = 'legacy'
+                self._legacy_genai = legacy_genai
                 logger.info("Gemini API 설정 완료 (기존 방식)")
-                
-                # GenerativeModel 방식 시도
-                if hasattr(genai, 'GenerativeModel'):
-                    model_names = ['gemini-2.5-flash', 'gemini-2.5-pro', 'gemini-2.5-flash-lite']
-                    for model_name in model_names:
-                        try:
-                            self.model = genai.GenerativeModel(model_name)
-                            logger.info(f"Gemini 모델 초기화 성공: {model_name}")
-                            break
-                        except Exception as e:
-                            logger.warning(f"모델 {model_name} 초기화 실패: {e}")
-                            continue
-                else:
-                    # 구버전: 모델명만 저장
-                    logger.info("GenerativeModel 클래스 없음, 직접 generate_content 사용")
-                    self.model = "gemini-pro"
-                    
-        except ImportError:
-            # google-generativeai 라이브러리 방식
-            import google.generativeai as genai
-            genai.configure(api_key=api_key)
-            self.api_type = 'legacy'
-            logger.info("google-generativeai 라이브러리 방식 사용")
+        
+        except Exception as e:
+            logger.error(f"Gemini API 설정 실패: {e}")
+            self.api_type = 'failed'
+    
+    def is_available(self) -> bool:
+        """클라이언트가 사용 가능한지 확인"""
+        self._ensure_setup()
+        return self.client is not None or self.model is not None or self._legacy_genai is not None
+    
+    def _load_legacy_model(self):
+        """기존 방식에서 사용할 모델을 처음 필요할 때 한 번만 찾습니다."""
+        with self._setup_lock:
+            if self.model is not None or self._legacy_genai is None:
+                return
+            genai = self._legacy_genai
             
             if hasattr(genai, 'GenerativeModel'):
-                model_names = ['gemini-2.5-flash', 'gemini-2.5-pro', 'gemini-2.5-flash-lite']
-                for model_name in model_names:
+                for model_name in LEGACY_MODEL_CANDIDATES:
+                    # 이전에 실패한 모델은 다시 시도하지 않음
+                    if model_name in GeminiClient._failed_models:
+                        continue
                     try:
-                        self.model = genai.GenerativeModel(model_name)
+                        self.model = _build_generative_model(model_name)
                         logger.info(f"Gemini 모델 초기화 성공: {model_name}")
                         break
                     except Exception as e:
+                        GeminiClient._failed_models.add(model_name)
                         logger.warning(f"모델 {model_name} 초기화 실패: {e}")
                         continue
             else:
+                # 구버전: 모델명만 저장
+                logger.info("GenerativeModel 클래스 없음, 직접 generate_content 사용")
                 self.model = "gemini-pro"
-        
-        except Exception as e:
-            logger.error(f"Gemini API 설정 실패: {e}")
-            self.api_type = 'failed'
-    
-    def is_available(self) -> bool:
-        """클라이언트가 사용 가능한지 확인"""
-        return self.client is not None or self.model is not None
+            
+            # 탐색은 한 번만 수행 (모든 모델이 실패하면 사용 불가 상태가 됨)
+            self._legacy_genai = None
     
     def generate_content(self, prompt: str, model_name: str = "gemini-2.5-flash") -> Optional[object]:
-        """콘텐츠 생성"""
+        """콘텐츠 생성 (model_name은 새 클라이언트 방식에서만 사용, 기존 방식은 초기화 때 찾은 모델 사용)"""
         if not self.is_available():
             logger.error("Gemini 클라이언트가 사용 불가능합니다.")
             return None
         
+        if self.api_type == 'legacy' and self.model is None:
+            self._load_legacy_model()
+            if self.model is None:
+                logger.error("사용 가능한 Gemini 모델이 없습니다.")
+                return None
+        
         try:
             if self.api_type == 'new_client':
                 # 새로운 클라이언트 방식
@@ -95,10 +153,11 @@ class GeminiClient:
                     contents=prompt
                 )
             elif isinstance(self.model, str):
-                # 구버전: Client 객체를 통한 호출
-                from google import genai
-                client = genai.Client()
-                response = client.models.generate_content(
+                # 구버전: Client 객체를 통한 호출 (Client는 한 번만 생성하여 재사용)
+                if self._legacy_client is None:
+                    from google import genai
+                    self._legacy_client = genai.Client()
+                response = self._legacy_client.models.generate_content(
                     model=self.model, 
                     contents=prompt
                 )
@@ -112,36 +171,30 @@ class GeminiClient:
             logger.error(f"Gemini API 호출 실패: {e}")
             return None
     
-    def extract_text_from_response(self, response) -> Optional[str]:
+    @staticmethod
+    def extract_text_from_response(response) -> Optional[str]:
         """응답에서 텍스트 추출 (다양한 버전 호환)"""
         if not response:
             return None
         
         try:
-            # 새로운 클라이언트 방식 응답 처리
-            if hasattr(response, 'text') and response.text:
-                return response.text
+            # 새로운 클라이언트 방식 응답 처리 (가장 흔한 경우를 먼저 확인)
+            text = getattr(response, 'text', None)
+            if text:
+                return text
             
             # 기존 방식 응답 처리
-            if hasattr(response, 'parts') and response.parts:
-                text_content = ""
-                for part in response.parts:
-                    if hasattr(part, 'text') and part.text:
-                        text_content += part.text
-                if text_content:
-                    return text_content
+            text = GeminiClient._join_parts_text(getattr(response, 'parts', None))
+            if text:
+                return text
             
             # 구버전 응답 구조
-            if hasattr(response, 'candidates') and response.candidates:
-                for candidate in response.candidates:
-                    if hasattr(candidate, 'content') and candidate.content:
-                        if hasattr(candidate.content, 'parts'):
-                            text_content = ""
-                            for part in candidate.content.parts:
-                                if hasattr(part, 'text') and part.text:
-                                    text_content += part.text
-                            if text_content:
-                                return text_content
+            for candidate in getattr(response, 'candidates', None) or ():
+                content = getattr(candidate, 'content', None)
+                if content:
+                    text = GeminiClient._join_parts_text(getattr(content, 'parts', None))
+                    if text:
+                        return text
             
             logger.warning("응답에서 텍스트를 추출할 수 없습니다.")
             return None
@@ -149,4 +202,10 @@ class GeminiClient:
         except Exception as e:
             logger.error(f"응답 텍스트 추출 중 오류: {e}")
             return None
-
+    
+    @staticmethod
+    def _join_parts_text(parts) -> str:
+        """parts 목록의 텍스트를 하나로 합칩니다."""
+        if not parts:
+            return ""
+        return "".join([t for t in (getattr(part, 'text', None) for part in parts) if t])
@@ -1,80 +1,31 @@
 """
 뉴스 포맷팅 관련 모듈
 """
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Optional
 from datetime import datetime
-from core.stock_utils import sort_news_by_stock_priority, get_popular_tags, format_news_with_stock_info
+from core.stock_utils import sort_news_by_stock_priority, get_popular_tags, format_news_with_stock_info, get_like_count
 
-class NewsFormatter:
-    """뉴스 포맷팅 클래스"""
-    
-    @staticmethod
-    def format_news_for_ai(news_list: List[Dict], max_items: int = 50) -> str:
-        """뉴스 목록을 AI가 이해하기 쉬운 형태로 변환합니다."""
-        formatted_news = []
-        
-        for i, news in enumerate(news_list[:max_items], 1):
-            title = news.get('title', '제목 없음')
-            content = news.get('content', '내용 없음')
-            author = news.get('author_name', 'Unknown')
-            created_at = news.get('created_at', '')
-            community_tags = news.get('community_tags', [])
-            like_count = news.get('like_stats', {}).get('like_count', 0)
-            view_count = news.get('view_count', 0)
-            
-            # 내용이 너무 길면 잘라내기
-            if len(content) > 500:
-                content = content[:500] + "..."
-            
-            # 태그 정보 추가
-            tags_info = f"태그: {', '.join(community_tags)}" if community_tags else "태그: 없음"
-            
-            news_item = f"""
-뉴스 {i}:
-제목: {title}
-작성자: {author} (좋아요: {like_count}, 조회수: {view_count})
-시간: {created_at}
-{tags_info}
-내용: {content}
-"""
-            formatted_news.append(news_item)
-        
-        return "\n".join(formatted_news)
-    
-    @staticmethod
-    def format_market_data_for_ai(market_data: Dict) -> str:
-        """시장 데이터를 AI가 이해하기 쉬운 형태로 변환합니다."""
-        market_text = ""
-        
-        # 나스닥 데이터
-        nasdaq = market_data.get('nasdaq', {})
-        if nasdaq:
-            market_text += f"""
+# 시장 데이터 템플릿
+_NASDAQ_MARKET_TEMPLATE = """
 📊 나스닥 실시간 정보:
-- 현재가: {nasdaq.get('current_price', 'N/A')} {nasdaq.get('currency', 'USD')}
-- 변동: {nasdaq.get('change', 'N/A')} ({nasdaq.get('change_percent', 'N/A')}%)
-- 전일종가: {nasdaq.get('previous_close', 'N/A')}
-- 시장상태: {nasdaq.get('market_state', 'N/A')}
+- 현재가: {} {}
+- 변동: {} ({}%)
+- 전일종가: {}
+- 시장상태: {}
 """
-        
-        # 공포탐욕지수 데이터
-        fear_greed = market_data.get('fear_greed', {})
-        if fear_greed:
-            market_text += f"""
+
+_FEAR_GREED_MARKET_TEMPLATE = """
 😨📈 공포탐욕지수:
-- 지수: {fear_greed.get('value', 'N/A')}
-- 분류: {fear_greed.get('classification', 'N/A')}
+- 지수: {}
+- 분류: {}
 """
-        
-        return market_text
-    
-    @staticmethod
-    def create_summary_prompt(news_text: str) -> str:
-        """AI 요약을 위한 프롬프트를 생성합니다."""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-        
-        prompt = f"""
-다음은 {current_time} 기준으로 수집된 주식/경제 관련 뉴스들입니다. 
+
+# 프롬프트 템플릿 (모듈 로드 시 한 번만 생성, 호출 시에는 치환만 수행)
+# 고정된 지시문을 앞에, 시각/데이터 등 매번 바뀌는 값을 뒤에 두어
+# Gemini의 암시적 프롬프트 캐싱(공통 접두사 재사용)이 적용되도록 함
+_SUMMARY_PROMPT_TEMPLATE = """
+다음은 아래 기준 시각에 수집된 주식/경제 관련 뉴스들입니다. 
 이 뉴스들을 분석하여 1시간 주요 동향 리포트를 작성해주세요.
 
 **요구사항:**
@@ -90,20 +41,16 @@ class NewsFormatter:
 - 전문 용어는 쉽게 설명
 - 한국어로 작성
 
+**기준 시각:** {current_time}
+
 **뉴스 데이터:**
 {news_text}
 
 위 뉴스들을 바탕으로 종합적인 시장 동향 리포트를 작성해주세요.
 """
-        return prompt
-    
-    @staticmethod
-    def create_enhanced_summary_prompt(news_text: str, market_text: str) -> str:
-        """시장 데이터를 포함한 간결한 AI 요약 프롬프트를 생성합니다."""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-        
-        prompt = f"""
-{current_time} 기준 주식/경제 뉴스와 시장 데이터를 분석하여 **Discord 임베드에 들어갈 간결한 요약**을 작성하세요.
+
+_ENHANCED_PROMPT_TEMPLATE = """
+아래 기준 시각의 주식/경제 뉴스와 시장 데이터를 분석하여 **Discord 임베드에 들어갈 간결한 요약**을 작성하세요.
 
 **중요 제약사항:**
 - 전체 요약을 **800자 이내**로 제한하세요
@@ -133,6 +80,8 @@ class NewsFormatter:
 
 핵심 키워드: [키워드1, 키워드2, 키워드3, 키워드4, 키워드5]
 
+**기준 시각:** {current_time}
+
 **시장 데이터:**
 {market_text}
 
@@ -141,23 +90,8 @@ class NewsFormatter:
 
 위 정보를 바탕으로 **800자 이내의 간결하고 가독성 좋은 시장 요약**을 작성하세요.
 """
-        return prompt
-
-    @staticmethod
-    def create_concise_one_liner_prompt(news_text: str, market_text: str, max_chars: int = 200) -> str:
-        """임베드에 들어갈 한 줄 요약 프롬프트를 생성합니다.
 
-        요구사항:
-        - 한 줄로만 작성 (줄바꿈 금지)
-        - 최대 {max_chars}자 이내
-        - 핵심 지수/방향성/대표 종목만 포함 (예: "나스닥 +0.8%, 공포탐욕 62(탐욕), AI/반도체 강세: NVDA TSLA")
-        - 불필요한 수식어, 장황한 설명, 마크다운, 이모지 최소화
-        - 한국어로 응답
-        """
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-        prompt = f"""
-현재 시간: {current_time}
+_ONE_LINER_PROMPT_TEMPLATE = """
 아래 시장 데이터와 뉴스 요약을 참고해, 디스코드 임베드 설명에 넣을 초간단 한 줄 요약을 생성하세요.
 
 규칙:
@@ -167,6 +101,8 @@ class NewsFormatter:
 - 불필요한 수식어, 긴 문장, 설명, 마크다운, 이모지는 사용하지 마세요.
 - 출력 예시: "나스닥 +0.8%, 공포탐욕 62(탐욕), AI/반도체 강세: NVDA TSLA"
 
+현재 시간: {current_time}
+
 시장 데이터:
 {market_text}
 
@@ -175,5 +111,112 @@ class NewsFormatter:
 
 요청: 위 정보를 압축해 한 줄 요약만 출력하세요. 줄바꿈이나 추가 설명 금지.
 """
-        return prompt
+
+
+class NewsFormatter:
+    """뉴스 포맷팅 클래스"""
+    
+    @staticmethod
+    def format_news_for_ai(news_list: List[Dict], max_items: int = 50, max_chars: Optional[int] = None) -> str:
+        """뉴스 목록을 AI가 이해하기 쉬운 형태로 변환합니다.
+
+        max_chars가 주어지면 결과가 이를 넘지 않도록, 추가하면 초과하는 뉴스에서 멈춥니다
+        (단, 첫 번째 뉴스는 길이와 무관하게 항상 포함).
+        """
+        parts = []
+        extend = parts.extend
+        total_chars = 0
+
+        for i, news in enumerate(islice(news_list, max_items), 1):
+            get = news.get
+            title = get('title') or '제목 없음'
+            content = get('content') or '내용 없음'
+            author = get('author_name') or 'Unknown'
+            created_at = get('created_at') or ''
+            community_tags = get('community_tags')
+            like_count = get_like_count(news)
+            view_count = get('view_count', 0)
+
+            # 내용이 너무 길면 잘라내기
+            content = content[:500] + "..." if len(content) > 500 else content
+
+            # 태그 정보 추가
+            tags_info = "태그: " + ", ".join(community_tags) if community_tags else "태그: 없음"
+
+            # 조각을 리스트에 모아 마지막에 한 번만 합치기
+            item = (
+                "\n뉴스 ", str(i), ":\n제목: ", title,
+                "\n작성자: ", author, " (좋아요: ", str(like_count), ", 조회수: ", str(view_count),
+                ")\n시간: ", created_at,
+                "\n", tags_info,
+                "\n내용: ", content, "\n",
+            )
+            # 추가하기 전에 예산을 확인해 버릴 조각을 만들지 않음
+            if max_chars is not None:
+                item_chars = sum(map(len, item))
+                if parts and total_chars + item_chars > max_chars:
+                    break
+                total_chars += item_chars
+
+            extend(item)
+
+        return "".join(parts)
+    
+    @staticmethod
+    def format_market_data_for_ai(market_data: Dict) -> str:
+        """시장 데이터를 AI가 이해하기 쉬운 형태로 변환합니다."""
+        parts = []
+        
+        # 나스닥 데이터
+        nasdaq = market_data.get('nasdaq')
+        if nasdaq:
+            get = nasdaq.get
+            parts.append(_NASDAQ_MARKET_TEMPLATE.format(
+                get('current_price', 'N/A'), get('currency', 'USD'),
+                get('change', 'N/A'), get('change_percent', 'N/A'),
+                get('previous_close', 'N/A'), get('market_state', 'N/A'),
+            ))
+        
+        # 공포탐욕지수 데이터
+        fear_greed = market_data.get('fear_greed')
+        if fear_greed:
+            parts.append(_FEAR_GREED_MARKET_TEMPLATE.format(
+                fear_greed.get('value', 'N/A'), fear_greed.get('classification', 'N/A'),
+            ))
+        
+        return "".join(parts)
+    
+    @staticmethod
+    def create_summary_prompt(news_text: str, current_time: Optional[str] = None) -> str:
+        """AI 요약을 위한 프롬프트를 생성합니다."""
+        if current_time is None:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+        return _SUMMARY_PROMPT_TEMPLATE.format(current_time=current_time, news_text=news_text)
+    
+    @staticmethod
+    def create_enhanced_summary_prompt(news_text: str, market_text: str, current_time: Optional[str] = None) -> str:
+        """시장 데이터를 포함한 간결한 AI 요약 프롬프트를 생성합니다."""
+        if current_time is None:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+        return _ENHANCED_PROMPT_TEMPLATE.format(current_time=current_time, market_text=market_text, news_text=news_text)
+
+    @staticmethod
+    def create_concise_one_liner_prompt(news_text: str, market_text: str, max_chars: int = 200, current_time: Optional[str] = None) -> str:
+        """임베드에 들어갈 한 줄 요약 프롬프트를 생성합니다.
+
+        요구사항:
+        - 한 줄로만 작성 (줄바꿈 금지)
+        - 최대 {max_chars}자 이내
+        - 핵심 지수/방향성/대표 종목만 포함 (예: "나스닥 +0.8%, 공포탐욕 62(탐욕), AI/반도체 강세: NVDA TSLA")
+        - 불필요한 수식어, 장황한 설명, 마크다운, 이모지 최소화
+        - 한국어로 응답
+        """
+        if current_time is None:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+        return _ONE_LINER_PROMPT_TEMPLATE.format(
+            current_time=current_time, max_chars=max_chars, market_text=market_text, news_text=news_text
+        )
 
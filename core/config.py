@@ -14,8 +14,12 @@ class Config:
     NEWS_API_URL = os.getenv('NEWS_API_URL', 'https://api.saveticker.com/api/news/list')
     API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 20))
     
-    # 속보 판단 키워드
-    BREAKING_NEWS_KEYWORDS = os.getenv('BREAKING_NEWS_KEYWORDS', '속보,긴급,중요,특보,긴급속보,특별속보').split(',')
+    # 속보 판단 키워드 (앞뒤 공백 제거, 빈 항목 제외. 매칭은 NewsAPIClient에서 하나의 정규식으로 컴파일)
+    BREAKING_NEWS_KEYWORDS = tuple(
+        keyword.strip()
+        for keyword in os.getenv('BREAKING_NEWS_KEYWORDS', '속보,긴급,중요,특보,긴급속보,특별속보').split(',')
+        if keyword.strip()
+    )
     
     # 일반 중요 메시지 판단 기준
     IMPORTANT_LIKE_THRESHOLD = int(os.getenv('IMPORTANT_LIKE_THRESHOLD', 5))
@@ -27,6 +31,7 @@ class Config:
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     REPORT_INTERVAL = int(os.getenv('REPORT_INTERVAL', 3600))  # 1시간 (3600초)
     REPORT_PAGE_SIZE = int(os.getenv('REPORT_PAGE_SIZE', 30))  # 리포트용 뉴스 수집 개수
+    REPORT_MIN_NEWS = int(os.getenv('REPORT_MIN_NEWS', 1))  # 이보다 뉴스가 적으면 리포트(AI 요약) 생략
     
     @classmethod
     def validate(cls):
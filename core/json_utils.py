@@ -0,0 +1,29 @@
+"""
+JSON 직렬화 유틸리티
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 동작합니다.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # orjson은 선택 의존성
+    orjson = None
+
+def loads(data: Union[bytes, str]) -> Any:
+    """bytes 또는 str을 파싱합니다 (orjson 사용 시 str 디코딩 없이 bytes를 바로 파싱)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps_bytes(obj: Any) -> bytes:
+    """obj를 키 정렬된 JSON bytes로 직렬화합니다 (해시 키 등 결정적인 출력이 필요할 때 사용)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=str)
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+
+def dumps_line(obj: Any) -> bytes:
+    """obj를 공백 없는 한 줄 UTF-8 JSON bytes(끝에 줄바꿈 포함)로 직렬화합니다 (캐시 파일 저장용)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
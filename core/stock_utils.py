@@ -1,11 +1,14 @@
 """
 주식 관련 유틸리티 함수들
 """
+import heapq
+import re
 from collections import Counter
-from typing import List, Dict, Tuple
+from itertools import chain
+from typing import List, Dict, Optional, Tuple
 
-# 유명한 주식 종목 리스트 (우선순위 순)
-FAMOUS_STOCKS = [
+# 유명한 주식 종목 목록 (우선순위 순, 실행 중 바뀌지 않도록 튜플로 고정)
+FAMOUS_STOCKS = (
     # 메가테크 (FAANG+)
     'AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'META', 'NFLX', 'TSLA', 'NVDA',
     # 반도체
@@ -23,69 +26,119 @@ FAMOUS_STOCKS = [
     'COIN', 'MSTR', 'RIOT', 'MARA', 'HUT', 'BITF', 'CAN', 'ARB', 'BIT',
     # AI/클라우드
     'SNOW', 'CRWD', 'ZS', 'OKTA', 'DDOG', 'NET', 'PLTR', 'AI', 'C3AI'
-]
+)
+
+# 종목 코드 -> 우선순위 (FAMOUS_STOCKS.index 선형 탐색 대신 사용)
+FAMOUS_STOCKS_PRIORITY = {stock: i for i, stock in enumerate(FAMOUS_STOCKS)}
+
+# 영문/숫자 묶음(점으로 이어진 BRK.B 같은 형태 포함)을 한 번에 잘라내는 정규식
+# 종목 코드 90여 개를 위치마다 대조하는 대신 토큰만 뽑아 사전에서 조회
+# 앞뒤에 영문/숫자가 붙어 있으면 같은 토큰이 되므로 다른 단어의 일부는 자연히 제외됨 (예: CATEGORY 안의 CAT)
+_STOCK_TOKEN_PATTERN = re.compile(r'[A-Za-z0-9]+(?:\.[A-Za-z0-9]+)*')
+# 종목 코드 하나가 가질 수 있는 점으로 나뉜 조각 수의 최댓값 (BRK.B -> 2)
+_MAX_STOCK_PARTS = max(stock.count('.') for stock in FAMOUS_STOCKS) + 1
+
+def _iter_famous_stocks(text: str):
+    """텍스트에 나오는 유명 종목 코드를 앞에서부터 차례로 반환합니다."""
+    # finditer로 필요한 만큼만 잘라내어, 우선순위 0 종목을 찾으면 나머지 본문은 건너뛸 수 있게 함
+    for match in _STOCK_TOKEN_PATTERN.finditer(text):
+        # 대소문자 무시: 짧은 토큰만 upper()로 바꿔 조회 (본문 전체를 복사하지 않음)
+        token = match.group().upper()
+        if '.' not in token:
+            if token in FAMOUS_STOCKS_PRIORITY:
+                yield token
+            continue
+        # 점으로 이어진 토큰은 조각 단위로, 긴 종목 코드부터 맞춰 봄 (예: BRK.B, AAPL.MSFT -> AAPL, MSFT)
+        parts = token.split('.')
+        i, n_parts = 0, len(parts)
+        while i < n_parts:
+            for size in range(min(_MAX_STOCK_PARTS, n_parts - i), 0, -1):
+                candidate = '.'.join(parts[i:i + size]) if size > 1 else parts[i]
+                if candidate in FAMOUS_STOCKS_PRIORITY:
+                    yield candidate
+                    i += size
+                    break
+            else:
+                i += 1
+
+def _find_famous_stock(title: str, content: str = "") -> Tuple[int, Optional[str]]:
+    """제목과 내용을 훑어 가장 우선순위가 높은 종목과 그 우선순위를 반환합니다."""
+    best_priority, best_stock = 999, None
+    # 제목과 내용을 이어 붙이지 않고 각각 검사 (결과는 동일)
+    for text in (title, content):
+        for stock in _iter_famous_stocks(text):
+            priority = FAMOUS_STOCKS_PRIORITY[stock]
+            if priority < best_priority:
+                best_priority, best_stock = priority, stock
+                if priority == 0:
+                    return best_priority, best_stock
+    
+    return best_priority, best_stock
+
+def _news_famous_stock(news: Dict) -> Tuple[int, Optional[str]]:
+    """뉴스의 (우선순위, 종목)을 반환합니다 (결과는 news['_famous_stock']에 캐시)."""
+    cached = news.get('_famous_stock')
+    if cached is None:
+        cached = _find_famous_stock(news.get('title') or '', news.get('content') or '')
+        news['_famous_stock'] = cached
+    return cached
 
 def contains_famous_stock(title: str, content: str = "") -> Tuple[bool, str]:
     """제목이나 내용에 유명한 주식이 포함되어 있는지 확인합니다."""
-    text = (title + " " + content).upper()
-    
-    for stock in FAMOUS_STOCKS:
-        if stock in text:
-            return True, stock
-    
-    return False, None
+    _, stock = _find_famous_stock(title, content)
+    return stock is not None, stock
 
 def get_stock_priority(title: str, content: str = "") -> int:
     """주식의 우선순위를 반환합니다 (낮은 숫자가 높은 우선순위)."""
-    contains_stock, stock_symbol = contains_famous_stock(title, content)
+    # 유명한 주식이 없으면 999 (낮은 우선순위)
+    priority, _ = _find_famous_stock(title, content)
+    return priority
+
+def get_like_count(news: Dict) -> int:
+    """뉴스의 좋아요 수를 반환합니다 (like_stats가 없거나 null이면 0, 빈 dict를 만들지 않음)."""
+    like_stats = news.get('like_stats')
+    return like_stats.get('like_count', 0) if like_stats else 0
+
+def _stock_sort_key(news: Dict) -> Tuple:
+    """유명한 주식 우선순위 정렬에 쓰는 키를 반환합니다."""
+    # 종목 탐색 결과는 뉴스별로 캐시되어 이후 정렬/포맷팅에서 재사용됨
+    stock_priority, _ = _news_famous_stock(news)
+    popularity = get_like_count(news) + news.get('view_count', 0) * 0.1
     
-    if contains_stock:
-        try:
-            return FAMOUS_STOCKS.index(stock_symbol)
-        except ValueError:
-            return 999  # 리스트에 없는 경우 낮은 우선순위
+    # 유명한 주식이 있으면 우선순위, 없으면 인기도 기준
+    if stock_priority < 999:
+        return (0, stock_priority, popularity)
     else:
-        return 999  # 유명한 주식이 없으면 낮은 우선순위
+        return (1, popularity, 0)
 
 def sort_news_by_stock_priority(news_list: List[Dict]) -> List[Dict]:
     """뉴스 목록을 유명한 주식 우선순위로 정렬합니다."""
-    def sort_key(news):
-        title = news.get('title', '')
-        content = news.get('content', '')
-        stock_priority = get_stock_priority(title, content)
-        popularity = news.get('like_stats', {}).get('like_count', 0) + news.get('view_count', 0) * 0.1
-        
-        # 유명한 주식이 있으면 우선순위, 없으면 인기도 기준
-        if stock_priority < 999:
-            return (0, stock_priority, popularity)
-        else:
-            return (1, popularity, 0)
-    
-    return sorted(news_list, key=sort_key)
+    return sorted(news_list, key=_stock_sort_key)
+
+def top_news_by_stock_priority(news_list: List[Dict], n: int) -> List[Dict]:
+    """유명한 주식 우선순위 상위 n개만 정렬해 반환합니다 (sort_news_by_stock_priority(news_list)[:n]와 같은 결과)."""
+    # 전체 정렬 대신 힙으로 상위 n개만 선택 (O(N log n))
+    return heapq.nsmallest(n, news_list, key=_stock_sort_key)
 
 def get_popular_tags(news_list: List[Dict], top_n: int = 5) -> List[Tuple[str, int]]:
     """뉴스 목록에서 인기 태그를 추출합니다."""
-    all_tags = []
-    for news in news_list:
-        tags = news.get('community_tags', [])
-        all_tags.extend(tags)
-    
-    if not all_tags:
-        return []
-    
-    tag_counts = Counter(all_tags)
+    # 중간 리스트 없이 태그를 바로 집계
+    tag_counts = Counter(chain.from_iterable(news.get('community_tags') or () for news in news_list))
     return tag_counts.most_common(top_n)
 
-def format_news_with_stock_info(news_list: List[Dict], max_items: int = 10) -> str:
-    """뉴스 목록을 주식 정보와 함께 포맷팅합니다."""
+def format_news_with_stock_info(news_list: List[Dict], max_items: int = 10, presorted: bool = False) -> str:
+    """뉴스 목록을 주식 정보와 함께 포맷팅합니다.
+
+    presorted가 True이면 news_list가 이미 sort_news_by_stock_priority로 정렬된 것으로 보고 다시 정렬하지 않습니다.
+    """
     formatted_items = []
-    sorted_news = sort_news_by_stock_priority(news_list)
+    sorted_news = news_list if presorted else top_news_by_stock_priority(news_list, max_items)
     
     for i, news in enumerate(sorted_news[:max_items], 1):
         title = news.get('title', '제목 없음')
         author = news.get('author_name', 'Unknown')
-        contains_stock, stock_symbol = contains_famous_stock(title, news.get('content', ''))
-        stock_info = f" [{stock_symbol}]" if contains_stock else ""
+        _, stock_symbol = _news_famous_stock(news)
+        stock_info = f" [{stock_symbol}]" if stock_symbol else ""
         formatted_items.append(f"{i}. {title} (by {author}){stock_info}")
     
     return "\n".join(formatted_items)
@@ -4,7 +4,6 @@ from typing import List
 import discord
 from discord.ext import commands
 
-from news.api_client import NewsAPIClient
 from news.cache_manager import NewsCacheManager
 from .embed_builder import EmbedBuilder
 from news.news_handler import NewsHandler
@@ -25,26 +24,25 @@ class CommandHandler:
         await ctx.send("뉴스를 확인 중입니다...")
         
         try:
-            async with NewsAPIClient(
-                self.config.API_URL,
-                self.config.NEWS_API_URL,
-                self.config.API_PAGE_SIZE, 
-                self.config.BREAKING_NEWS_KEYWORDS
-            ) as api_client:
-                latest_news = await self.news_handler.get_manual_news(api_client, self.embed_builder, 3)
+            api_client = await self.news_handler.get_api_client()
+            latest_news = await self.news_handler.get_manual_news(api_client, self.embed_builder, 3)
+            
+            if latest_news:
+                async def build_embed(news):
+                    news_type = api_client.get_news_type(news)
+                    is_breaking = api_client.is_breaking_news(news)
+                    # News API에서 온 뉴스만 중요 뉴스 구분 적용
+                    from_news_api = news.get('_source_api') == 'news'
+                    is_important = api_client.is_important_news(news, self.config.IMPORTANT_LIKE_THRESHOLD, from_news_api)
+                    return await self.embed_builder.create_news_embed(news, api_client, news_type, is_breaking, is_important)
                 
-                if latest_news:
-                    for news in latest_news:
-                        news_type = api_client.get_news_type(news)
-                        is_breaking = api_client.is_breaking_news(news)
-                        # News API에서 온 뉴스만 중요 뉴스 구분 적용
-                        from_news_api = news.get('_source_api') == 'news'
-                        is_important = api_client.is_important_news(news, self.config.IMPORTANT_LIKE_THRESHOLD, from_news_api)
-                        embed = await self.embed_builder.create_news_embed(news, api_client, news_type, is_breaking, is_important)
-                        await ctx.send(embed=embed)
-                        await asyncio.sleep(1)
-                else:
-                    await ctx.send("뉴스를 가져올 수 없습니다.")
+                # 임베드는 한꺼번에 만들고, 전송은 순서를 지키며 고정 대기 없이 진행
+                # (요청 속도 제한은 discord.py가 응답 헤더를 보고 자동으로 조절)
+                embeds = await asyncio.gather(*(build_embed(news) for news in latest_news))
+                for embed in embeds:
+                    await ctx.send(embed=embed)
+            else:
+                await ctx.send("뉴스를 가져올 수 없습니다.")
         except Exception as e:
             await ctx.send(f"오류가 발생했습니다: {e}")
     
@@ -99,7 +97,7 @@ class CommandHandler:
                 await ctx.send("❌ 이 명령어는 관리자만 사용할 수 있습니다.")
                 return
             
-            backup_path = self.cache_manager.backup_cache()
+            backup_path = await self.cache_manager.backup_cache_async()
             if backup_path:
                 embed = discord.Embed(
                     title="💾 캐시 백업",
@@ -132,20 +130,15 @@ class CommandHandler:
             '_source_api': 'news'  # 테스트는 News API로 간주
         }
         
-        async with NewsAPIClient(
-            self.config.API_URL,
-            self.config.NEWS_API_URL,
-            self.config.API_PAGE_SIZE, 
-            self.config.BREAKING_NEWS_KEYWORDS
-        ) as api_client:
-            is_breaking = api_client.is_breaking_news(test_news)
-            news_type = api_client.get_news_type(test_news)
-            
-            # 제목 정리 테스트
-            clean_title = self.embed_builder._clean_news_title(test_text)
-            
-            embed = await self.embed_builder.create_test_embed(test_text, clean_title, is_breaking, news_type)
-            await ctx.send(embed=embed)
+        api_client = await self.news_handler.get_api_client()
+        is_breaking = api_client.is_breaking_news(test_news)
+        news_type = api_client.get_news_type(test_news)
+        
+        # 제목 정리 테스트
+        clean_title = self.embed_builder._clean_news_title(test_text)
+        
+        embed = await self.embed_builder.create_test_embed(test_text, clean_title, is_breaking, news_type)
+        await ctx.send(embed=embed)
 
 
 
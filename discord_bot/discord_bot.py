@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands, tasks
 import logging
-from typing import List
+from typing import Dict, List
 
 from core.config import Config
 from news.cache_manager import NewsCacheManager
@@ -36,17 +36,24 @@ class StockNewsBot(commands.Bot):
         self.news_handler = NewsHandler(self.config, self.cache_manager)
         self.command_handler = CommandHandler(self.config, self.cache_manager, self.embed_builder, self.news_handler)
         self.report_scheduler = None  # on_ready에서 초기화
+        # 토픽별 타겟 채널 캐시 (채널/서버 변경 이벤트에서 비움)
+        self._topic_channel_cache: Dict[str, List[discord.TextChannel]] = {}
         
     async def on_ready(self):
         logger.info(f'{self.user}로 로그인했습니다!')
+        # 재연결 시 서버 목록이 바뀌었을 수 있으므로 채널 캐시를 새로 구성
+        self._topic_channel_cache.clear()
         logger.info(f'속보 키워드: {self.config.BREAKING_NEWS_KEYWORDS}')
         
         # american_stock 토픽을 가진 채널들 찾기
         target_channels = await self.find_channels_by_topic('american_stock')
         logger.info(f'american_stock 토픽을 가진 채널 {len(target_channels)}개를 찾았습니다.')
         
-        # 리포트 스케줄러 초기화
-        self.report_scheduler = ReportScheduler(self.config, target_channels, self.embed_builder)
+        # 리포트 스케줄러 초기화 (재연결 시에는 기존 스케줄러와 세션을 재사용하고 채널만 갱신)
+        if self.report_scheduler is None:
+            self.report_scheduler = ReportScheduler(self.config, target_channels, self.embed_builder)
+        else:
+            self.report_scheduler.target_channels = target_channels
         
         # 뉴스 체크 작업 시작 (NEWS_API_URL만 처리)
         if not self.check_news.is_running():
@@ -57,17 +64,51 @@ class StockNewsBot(commands.Bot):
         logger.info("뉴스 체크 및 리포트 스케줄러가 시작되었습니다.")
     
     async def find_channels_by_topic(self, topic: str) -> List[discord.TextChannel]:
-        """특정 토픽을 가진 텍스트 채널들을 찾습니다."""
-        target_channels = []
+        """특정 토픽을 가진 텍스트 채널들을 찾습니다 (결과는 채널/서버가 바뀔 때까지 캐시)."""
+        cached = self._topic_channel_cache.get(topic)
+        if cached is not None:
+            return list(cached)
         
-        for guild in self.guilds:
-            for channel in guild.text_channels:
-                # 채널 토픽이 설정되어 있고, 지정된 토픽을 포함하는 경우
-                if channel.topic and topic in channel.topic:
-                    target_channels.append(channel)
-                    logger.info(f'타겟 채널 발견: {guild.name} - #{channel.name}')
+        # 채널 토픽이 설정되어 있고, 지정된 토픽을 포함하는 경우 (중첩 루프 대신 한 번의 컴프리헨션)
+        target_channels = [
+            channel
+            for guild in self.guilds
+            for channel in guild.text_channels
+            if channel.topic and topic in channel.topic
+        ]
+        for channel in target_channels:
+            logger.info(f'타겟 채널 발견: {channel.guild.name} - #{channel.name}')
         
-        return target_channels
+        self._topic_channel_cache[topic] = target_channels
+        return list(target_channels)
+    
+    def _invalidate_channel_cache(self):
+        """토픽별 채널 캐시를 비웁니다."""
+        self._topic_channel_cache.clear()
+    
+    # 채널 토픽이나 서버 구성이 바뀌면 다음 조회 때 채널을 다시 찾음
+    async def on_guild_channel_create(self, channel):
+        self._invalidate_channel_cache()
+    
+    async def on_guild_channel_delete(self, channel):
+        self._invalidate_channel_cache()
+    
+    async def on_guild_channel_update(self, before, after):
+        self._invalidate_channel_cache()
+    
+    async def on_guild_join(self, guild):
+        self._invalidate_channel_cache()
+    
+    async def on_guild_remove(self, guild):
+        self._invalidate_channel_cache()
+    
+    async def close(self):
+        """봇 종료 시 공유 HTTP 세션을 정리합니다."""
+        await self.news_handler.close()
+        await self.image_handler.close()
+        if self.report_scheduler:
+            await self.report_scheduler.close()
+        await super().close()
     
     async def on_command_error(self, ctx, error):
         logger.error(f'명령어 오류: {error}')
@@ -1,9 +1,43 @@
 import re
+from functools import lru_cache
+from itertools import islice
 from datetime import datetime
 from typing import Dict
 import discord
 
 from news.api_client import NewsAPIClient
+from core.stock_utils import get_like_count
+
+# 제목에서 제거할 속보/중요뉴스 키워드 (대소문자 구분 없이, 긴 키워드 우선)
+_TITLE_KEYWORDS = [
+    '긴급속보', '특별속보', '속보', '긴급', '중요', '특보',
+    'BREAKING', 'URGENT', 'IMPORTANT', 'ALERT'
+]
+# [속보], (속보), 【속보】, 속보: 처럼 괄호/콜론과 붙어 있는 형태의 키워드
+_TITLE_TAG_WORDS = '속보|긴급|중요|특보|BREAKING|URGENT'
+
+# 제목 정리용 정규식 (모듈 로드 시 한 번만 컴파일)
+# 괄호/콜론 형태를 먼저 시도하고, 나머지는 단어 경계를 고려한 단독 키워드로 제거
+_TITLE_TAG_PATTERN = re.compile(
+    rf'\[(?:{_TITLE_TAG_WORDS})\]|\((?:{_TITLE_TAG_WORDS})\)|【(?:{_TITLE_TAG_WORDS})】|(?:{_TITLE_TAG_WORDS}):'
+    + r'|\b(?:' + '|'.join(re.escape(keyword) for keyword in _TITLE_KEYWORDS) + r')\b',
+    re.IGNORECASE
+)
+_LEADING_PUNCT_PATTERN = re.compile(r'^[:\-\s]+')
+
+@lru_cache(maxsize=4096)
+def _clean_news_title_cached(title: str) -> str:
+    """제목 정리 결과를 캐시합니다 (같은 뉴스를 여러 채널에 보낼 때 정규식 작업을 반복하지 않음)."""
+    # [속보]/(속보)/【속보】/속보: 형태와 단독 키워드를 한 번에 제거
+    clean_title = _TITLE_TAG_PATTERN.sub('', title)
+    
+    # 여러 공백을 하나로 정리하고 앞뒤 공백 제거 (정규식 대신 str.split 사용)
+    clean_title = ' '.join(clean_title.split())
+    
+    # 콜론이나 대시 뒤의 공백 정리
+    clean_title = _LEADING_PUNCT_PATTERN.sub('', clean_title)
+    
+    return clean_title if clean_title else "제목 없음"
 
 class EmbedBuilder:
     """Discord 임베드 생성을 담당하는 클래스"""
@@ -24,50 +58,57 @@ class EmbedBuilder:
             color = 0x00ff00  # 초록색 (일반)
             emoji = "📈"
         
+        # 반복되는 dict 조회를 줄이기 위해 미리 지역 변수로 꺼내 둠
+        get = news.get
+        
         # 제목에서 속보/중요뉴스 키워드 제거하고 깔끔한 헤드라인만 표시
-        clean_title = self._clean_news_title(news.get('title', '제목 없음'))
+        clean_title = self._clean_news_title(get('title', '제목 없음'))
+        
+        # 본문은 1000자까지만 표시
+        content = get('content') or '내용 없음'
+        description = content[:1000] + '...' if len(content) > 1000 else content
         
         embed = discord.Embed(
             title=f"{emoji} {clean_title}",
-            description=news.get('content', '내용 없음')[:1000] + ('...' if len(news.get('content', '')) > 1000 else ''),
+            description=description,
             color=color,
             timestamp=datetime.now()
         )
         
         # 작성자 정보
-        author_name = news.get('author_name', 'Unknown')
-        author_points = news.get('author_points', 0)
+        author_name = get('author_name', 'Unknown')
+        author_points = get('author_points', 0)
         embed.set_author(name=f"{author_name} (포인트: {author_points:,})")
         
         # 뉴스 타입 표시
         embed.add_field(name="📋 분류", value=news_type, inline=True)
         
         # 통계 정보
-        like_count = news.get('like_stats', {}).get('like_count', 0)
-        view_count = news.get('view_count', 0)
-        comment_count = news.get('comment_count', 0)
+        like_count = get_like_count(news)
+        view_count = get('view_count', 0)
+        comment_count = get('comment_count', 0)
         
         embed.add_field(name="📊 통계", value=f"👍 {like_count} | 👁️ {view_count} | 💬 {comment_count}", inline=True)
         
         # 생성 시간
-        created_at = news.get('created_at', '')
+        created_at = get('created_at', '')
         if created_at:
             embed.add_field(name="📅 작성 시간", value=created_at[:19], inline=True)
         
         # 커뮤니티 태그
-        community_tags = news.get('community_tags', [])
+        community_tags = get('community_tags', [])
         if community_tags:
-            tags_text = ', '.join(community_tags[:3])  # 최대 3개 태그만 표시
+            tags_text = ', '.join(islice(community_tags, 3))  # 최대 3개 태그만 표시
             embed.add_field(name="🏷️ 태그", value=tags_text, inline=False)
         
         # 상세 링크
-        source_api = news.get('_source_api', 'community')
-        news_url = api_client.format_news_url(news.get('id', ''), source_api)
+        source_api = get('_source_api', 'community')
+        news_url = api_client.format_news_url(get('id', ''), source_api)
         embed.add_field(name="🔗 상세 보기", value=f"[링크]({news_url})", inline=False)
         
         # 썸네일 (유효한 URL만 설정)
         if allow_thumbnail:
-            thumbnail_url = news.get('thumbnail')
+            thumbnail_url = get('thumbnail')
             normalized = self._normalize_url(thumbnail_url)
             if normalized:
                 embed.set_thumbnail(url=normalized)
@@ -86,40 +127,7 @@ class EmbedBuilder:
         """뉴스 제목에서 속보/중요뉴스 키워드를 제거하고 깔끔하게 정리합니다."""
         if not title:
             return "제목 없음"
-        
-        # 제거할 키워드들 (대소문자 구분 없이)
-        keywords_to_remove = [
-            '속보', '긴급', '중요', '특보', '긴급속보', '특별속보',
-            'BREAKING', 'URGENT', 'IMPORTANT', 'ALERT'
-        ]
-        
-        # [속보], (속보), 【속보】 등의 패턴 제거
-        patterns_to_remove = [
-            r'\[속보\]', r'\(속보\)', r'【속보】', r'\[긴급\]', r'\(긴급\)', r'【긴급】',
-            r'\[중요\]', r'\(중요\)', r'【중요】', r'\[특보\]', r'\(특보\)', r'【특보】',
-            r'\[BREAKING\]', r'\(BREAKING\)', r'\[URGENT\]', r'\(URGENT\)',
-            r'속보:', r'긴급:', r'중요:', r'특보:', r'BREAKING:', r'URGENT:'
-        ]
-        
-        clean_title = title
-        
-        # 패턴 제거
-        for pattern in patterns_to_remove:
-            clean_title = re.sub(pattern, '', clean_title, flags=re.IGNORECASE)
-        
-        # 키워드 제거 (단어 경계 고려)
-        for keyword in keywords_to_remove:
-            # 단어 경계를 고려하여 키워드 제거
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            clean_title = re.sub(pattern, '', clean_title, flags=re.IGNORECASE)
-        
-        # 여러 공백을 하나로 정리하고 앞뒤 공백 제거
-        clean_title = re.sub(r'\s+', ' ', clean_title).strip()
-        
-        # 콜론이나 대시 뒤의 공백 정리
-        clean_title = re.sub(r'^[:\-\s]+', '', clean_title)
-        
-        return clean_title if clean_title else "제목 없음"
+        return _clean_news_title_cached(title)
     
     async def create_status_embed(self, target_channels, config, cache_stats) -> discord.Embed:
         """봇 상태 임베드를 생성합니다."""
@@ -130,10 +138,8 @@ class EmbedBuilder:
         
         # 타겟 채널 정보
         if target_channels:
-            channel_list = []
-            for channel in target_channels[:5]:  # 최대 5개만 표시
-                channel_list.append(f"#{channel.name} ({channel.guild.name})")
-            channel_text = "\n".join(channel_list)
+            # 최대 5개만 표시
+            channel_text = "\n".join(f"#{channel.name} ({channel.guild.name})" for channel in islice(target_channels, 5))
             if len(target_channels) > 5:
                 channel_text += f"\n... 외 {len(target_channels) - 5}개 채널"
         else:
@@ -1,15 +1,35 @@
 import logging
 import aiohttp
 from io import BytesIO
+from typing import Optional
 import discord
 
 logger = logging.getLogger(__name__)
 
+# 첨부할 이미지의 최대 크기 (Discord 기본 첨부 제한)
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
+# 이미지를 나눠 받을 때 한 번에 읽는 크기
+IMAGE_CHUNK_SIZE = 64 * 1024
+
 class ImageHandler:
     """이미지 처리 및 전송을 담당하는 클래스"""
     
     def __init__(self):
-        pass
+        # 이미지마다 세션을 새로 만들지 않도록 공유 세션을 재사용 (처음 사용할 때 생성)
+        self._session = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """keep-alive 연결을 재사용하는 공유 세션을 반환합니다."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=60, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+    
+    async def close(self):
+        """공유 세션을 닫습니다."""
+        if self._session:
+            await self._session.close()
+            self._session = None
     
     async def send_image_attachment(self, channel, image_url: str, filename: str):
         """이미지를 첨부파일로 전송합니다."""
@@ -18,18 +38,44 @@ class ImageHandler:
             if not normalized:
                 logger.warning("유효하지 않은 이미지 URL, 첨부를 건너뜁니다.")
                 return
-            async with aiohttp.ClientSession() as session:
-                async with session.get(normalized) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-                        file = discord.File(BytesIO(image_data), filename=f"{filename}.jpg")
-                        await channel.send(file=file)
-                        logger.info(f"이미지 첨부 완료: {filename}")
-                    else:
-                        logger.warning(f"이미지 다운로드 실패: HTTP {response.status}")
+            session = await self._get_session()
+            async with session.get(normalized) as response:
+                if response.status == 200:
+                    image_buffer = await self._read_image(response)
+                    if image_buffer is None:
+                        return
+                    # 받은 버퍼를 그대로 넘겨 bytes를 다시 복사하지 않음
+                    file = discord.File(image_buffer, filename=f"{filename}.jpg")
+                    await channel.send(file=file)
+                    logger.info(f"이미지 첨부 완료: {filename}")
+                else:
+                    logger.warning(f"이미지 다운로드 실패: HTTP {response.status}")
         except Exception as e:
             logger.error(f"이미지 첨부 중 오류 발생: {e}")
 
+    async def _read_image(self, response: aiohttp.ClientResponse) -> Optional[BytesIO]:
+        """응답 본문을 나눠 받아 버퍼에 담습니다 (이미지가 아니거나 너무 크면 None)."""
+        # 헤더가 없으면 aiohttp는 application/octet-stream으로 보고하므로 함께 허용
+        content_type = response.content_type
+        if not content_type.startswith('image/') and content_type != 'application/octet-stream':
+            logger.warning(f"이미지가 아닌 응답, 첨부를 건너뜁니다: {content_type}")
+            return None
+        
+        content_length = response.content_length
+        if content_length is not None and content_length > MAX_IMAGE_BYTES:
+            logger.warning(f"이미지가 너무 큽니다 ({content_length} bytes), 첨부를 건너뜁니다.")
+            return None
+        
+        buffer = BytesIO()
+        async for chunk in response.content.iter_chunked(IMAGE_CHUNK_SIZE):
+            buffer.write(chunk)
+            if buffer.tell() > MAX_IMAGE_BYTES:
+                logger.warning(f"이미지가 너무 큽니다 ({MAX_IMAGE_BYTES} bytes 초과), 첨부를 건너뜁니다.")
+                return None
+        
+        buffer.seek(0)
+        return buffer
+
     def _normalize_url(self, url: str) -> str:
         if not url or not isinstance(url, str):
             return None
@@ -1,10 +1,63 @@
 import discord
+from bisect import bisect_right
 from datetime import datetime
 from typing import Optional, Dict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 공포탐욕지수 구간 경계(이상)와 구간별 (이모지, 시장 심리, 투자 조언) - 낮은 구간부터
+# _FEAR_GREED_BUCKETS[i]는 _FEAR_GREED_THRESHOLDS[i-1] 이상 _FEAR_GREED_THRESHOLDS[i] 미만 구간
+_FEAR_GREED_THRESHOLDS = (25, 45, 55, 75)
+_FEAR_GREED_BUCKETS = (
+    ("😱", "극도 공포 (과매도)", "대량 매수 기회"),
+    ("😰", "공포 (하락 압력)", "저점 매수 기회"),
+    ("😐", "중립 (보합세)", "관망 또는 분할 매수"),
+    ("😊", "탐욕 (상승 추세)", "적정 매수 기회"),
+    ("😍", "극도 탐욕 (과열 주의)", "고점 매도 고려"),
+)
+
+# 나스닥 변동률 구간: (하한(초과), 추세) - 높은 구간부터, 나머지는 하락세
+_NASDAQ_TREND_BUCKETS = (
+    (1, "📈 강한 상승세"),
+    (0, "📈 상승세"),
+    (-1, "📊 보합세"),
+)
+
+# 뉴스 개수 구간: (하한(초과), 활동도) - 높은 구간부터, 나머지는 조용
+_NEWS_ACTIVITY_BUCKETS = (
+    (20, "🔥 매우 활발"),
+    (10, "📈 활발"),
+    (5, "📊 보통"),
+)
+
+def _fear_greed_bucket(fg_value) -> tuple:
+    """공포탐욕지수 값이 속한 구간의 (이모지, 시장 심리, 투자 조언)을 반환합니다."""
+    # 경계 목록을 이진 탐색해 구간을 한 번에 찾음
+    return _FEAR_GREED_BUCKETS[bisect_right(_FEAR_GREED_THRESHOLDS, fg_value)]
+
+def _time_advice_for_hour(hour: int) -> str:
+    """시간대별 투자 팁을 반환합니다."""
+    if 9 <= hour <= 16:
+        return "🕘 장중 - 실시간 모니터링"
+    elif 16 < hour <= 20:
+        return "🕕 장후 - 다음날 준비"
+    elif 20 < hour <= 24 or 0 <= hour < 6:
+        return "🌙 야간 - 해외 시장 주시"
+    else:
+        return "🌅 장전 - 오늘 전략 수립"
+
+# 시(0~23)별 투자 팁 (리포트마다 분기하지 않고 인덱스로 조회)
+_TIME_ADVICE_BY_HOUR = tuple(_time_advice_for_hour(hour) for hour in range(24))
+
+# 디스코드 임베드 필드 값 최대 길이
+FIELD_VALUE_LIMIT = 1024
+_ELLIPSIS = "..."
+
+def _cap(text: str, limit: int = FIELD_VALUE_LIMIT) -> str:
+    """text가 limit자를 넘으면 말줄임표를 포함해 limit자로 자릅니다."""
+    return text if len(text) <= limit else text[:limit - len(_ELLIPSIS)] + _ELLIPSIS
+
 class ReportBuilder:
     def __init__(self):
         """리포트 임베드 빌더를 초기화합니다."""
@@ -34,26 +87,23 @@ class ReportBuilder:
             )
             
             # 요약 내용 설정 (Discord 필드 최대 길이: 2000자로 확장)
-            if len(ai_summary) > 2000:
-                ai_summary = ai_summary[:1997] + "..."
-            
             embed.add_field(
                 name="📊 1시간 주요 동향",
-                value=ai_summary,
+                value=_cap(ai_summary, 2000),
                 inline=False
             )
 
             # 주요 헤드라인 (디스코드 필드 최대 길이: 1024자)
             if headlines:
-                truncated_headlines = headlines if len(headlines) <= 1024 else headlines[:1020] + "..."
                 embed.add_field(
                     name="📰 주요 헤드라인",
-                    value=truncated_headlines,
+                    value=_cap(headlines),
                     inline=False
                 )
             
             # 시장 데이터 정보 추가
-            market_info = ""
+            # 줄마다 문자열을 새로 만들지 않도록 조각을 모아 한 번에 합침
+            market_lines = []
             if market_data:
                 nasdaq = market_data.get('nasdaq', {})
                 fear_greed = market_data.get('fear_greed', {})
@@ -61,34 +111,20 @@ class ReportBuilder:
                 if nasdaq:
                     change_emoji = "📈" if nasdaq.get('change', 0) >= 0 else "📉"
                     stale_suffix = " (stale)" if nasdaq.get('stale') else ""
-                    market_info += f"{change_emoji} **나스닥**: {nasdaq.get('current_price', 'N/A')} ({nasdaq.get('change_percent', 'N/A')}%){stale_suffix}\n"
+                    market_lines.append(f"{change_emoji} **나스닥**: {nasdaq.get('current_price', 'N/A')} ({nasdaq.get('change_percent', 'N/A')}%){stale_suffix}\n")
                 
                 if fear_greed:
                     fg_value = fear_greed.get('value', 0)
-                    if fg_value >= 75:
-                        fg_emoji = "😍"
-                    elif fg_value >= 55:
-                        fg_emoji = "😊"
-                    elif fg_value >= 45:
-                        fg_emoji = "😐"
-                    elif fg_value >= 25:
-                        fg_emoji = "😰"
-                    else:
-                        fg_emoji = "😱"
+                    fg_emoji = _fear_greed_bucket(fg_value)[0]
                     
                     fg_stale_suffix = " (stale)" if fear_greed.get('stale') else ""
-                    market_info += f"{fg_emoji} **공포탐욕지수**: {fg_value} ({fear_greed.get('classification', 'N/A')}){fg_stale_suffix}\n"
+                    market_lines.append(f"{fg_emoji} **공포탐욕지수**: {fg_value} ({fear_greed.get('classification', 'N/A')}){fg_stale_suffix}\n")
             
             # 시장 정보 필드 길이 제한
-            if len(market_info) > 1024:
-                market_info = market_info[:1020] + "..."
-            
-            # 강화된 투자자 정보 생성
-            investor_info = self._create_enhanced_investor_info(market_data, news_count, current_time)
+            market_info = _cap("".join(market_lines))
             
-            # 투자자 정보 필드 길이 제한
-            if len(investor_info) > 1024:
-                investor_info = investor_info[:1020] + "..."
+            # 강화된 투자자 정보 생성 (필드 길이 제한 적용)
+            investor_info = _cap(self._create_enhanced_investor_info(market_data, news_count, current_time))
             
             embed.add_field(
                 name="💼 투자자 정보",
@@ -153,7 +189,8 @@ class ReportBuilder:
     
     def _create_enhanced_investor_info(self, market_data: Dict, news_count: int, current_time) -> str:
         """강화된 투자자 정보를 생성합니다."""
-        investor_info = ""
+        # 줄마다 문자열을 새로 만들지 않도록 조각을 모아 한 번에 합침
+        investor_lines = []
         
         # 시장 상황 분석
         nasdaq = market_data.get('nasdaq', {}) if market_data else {}
@@ -161,66 +198,29 @@ class ReportBuilder:
         
         # 시장 심리 분석
         if fear_greed:
-            fg_value = fear_greed.get('value', 0)
-            if fg_value >= 75:
-                market_sentiment = "😍 극도 탐욕 (과열 주의)"
-                advice = "고점 매도 고려"
-            elif fg_value >= 55:
-                market_sentiment = "😊 탐욕 (상승 추세)"
-                advice = "적정 매수 기회"
-            elif fg_value >= 45:
-                market_sentiment = "😐 중립 (보합세)"
-                advice = "관망 또는 분할 매수"
-            elif fg_value >= 25:
-                market_sentiment = "😰 공포 (하락 압력)"
-                advice = "저점 매수 기회"
-            else:
-                market_sentiment = "😱 극도 공포 (과매도)"
-                advice = "대량 매수 기회"
+            fg_emoji, sentiment, advice = _fear_greed_bucket(fear_greed.get('value', 0))
             
-            investor_info += f"🎯 **시장 심리**: {market_sentiment}\n"
-            investor_info += f"💡 **투자 조언**: {advice}\n"
+            investor_lines.append(f"🎯 **시장 심리**: {fg_emoji} {sentiment}\n")
+            investor_lines.append(f"💡 **투자 조언**: {advice}\n")
         
         # 나스닥 분석
         if nasdaq:
             change_percent = nasdaq.get('change_percent', 0)
-            if change_percent > 1:
-                trend = "📈 강한 상승세"
-            elif change_percent > 0:
-                trend = "📈 상승세"
-            elif change_percent > -1:
-                trend = "📊 보합세"
-            else:
-                trend = "📉 하락세"
+            trend = next((label for lower, label in _NASDAQ_TREND_BUCKETS if change_percent > lower), "📉 하락세")
             
-            investor_info += f"📊 **나스닥 추세**: {trend}\n"
+            investor_lines.append(f"📊 **나스닥 추세**: {trend}\n")
         
         # 뉴스 활동도
-        if news_count > 20:
-            activity = "🔥 매우 활발"
-        elif news_count > 10:
-            activity = "📈 활발"
-        elif news_count > 5:
-            activity = "📊 보통"
-        else:
-            activity = "😴 조용"
+        activity = next((label for lower, label in _NEWS_ACTIVITY_BUCKETS if news_count > lower), "😴 조용")
         
-        investor_info += f"📰 **뉴스 활동도**: {activity} ({news_count}개)\n"
+        investor_lines.append(f"📰 **뉴스 활동도**: {activity} ({news_count}개)\n")
         
         # 시간대별 투자 팁
-        hour = current_time.hour
-        if 9 <= hour <= 16:
-            time_advice = "🕘 장중 - 실시간 모니터링"
-        elif 16 < hour <= 20:
-            time_advice = "🕕 장후 - 다음날 준비"
-        elif 20 < hour <= 24 or 0 <= hour < 6:
-            time_advice = "🌙 야간 - 해외 시장 주시"
-        else:
-            time_advice = "🌅 장전 - 오늘 전략 수립"
+        time_advice = _TIME_ADVICE_BY_HOUR[current_time.hour]
         
-        investor_info += f"⏰ **시간대 조언**: {time_advice}\n"
+        investor_lines.append(f"⏰ **시간대 조언**: {time_advice}\n")
         
         # 추가 투자 팁
-        investor_info += f"📅 **업데이트**: {current_time.strftime('%H:%M')}\n"
+        investor_lines.append(f"📅 **업데이트**: {current_time.strftime('%H:%M')}\n")
         
-        return investor_info
+        return "".join(investor_lines)
@@ -1,18 +1,51 @@
 import asyncio
 import aiohttp
 import logging
+import re
+from operator import itemgetter
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from discord.ext import tasks
 
+from core import json_utils
 from core.config import Config
 from ai.ai_summarizer import AISummarizer
 from .report_builder import ReportBuilder
 from news.market_data import MarketDataCollector
-from core.stock_utils import format_news_with_stock_info
+from core.stock_utils import format_news_with_stock_info, get_like_count
 
 logger = logging.getLogger(__name__)
 
+# 리포트를 동시에 전송할 최대 채널 수 (채널별 속도 제한은 discord.py가 처리)
+REPORT_SEND_CONCURRENCY = 5
+# 이 시간 안에 작성된 뉴스는 중요도 점수에 최근성 보너스를 받음
+RECENT_BONUS_WINDOW = timedelta(minutes=30)
+
+# 제목 정규화용 정규식 (뉴스마다 다시 해석하지 않도록 미리 컴파일)
+_PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# 중요도 점수에 반영할 제목 키워드 (소문자)
+IMPORTANT_KEYWORDS = [
+    '속보', '긴급', '중요', '특보', '급등', '급락', '폭등', '폭락',
+    'ai', '반도체', '테슬라', '애플', '구글', '마이크로소프트', '아마존',
+    'nvidia', 'amd', '인텔', '삼성', 'sk하이닉스', 'lg', '현대차',
+    'fed', '연준', '금리', '인플레이션', 'gdp', '고용지표'
+]
+# 키워드마다 제목을 다시 훑지 않도록 한 번에 찾는 정규식 (긴 키워드 우선)
+# 전방탐색으로 감싸 '긴급등'의 '긴급'/'급등'처럼 겹치는 키워드도 모두 찾음
+_IMPORTANT_KEYWORDS_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword in sorted(IMPORTANT_KEYWORDS, key=len, reverse=True)) + '))'
+)
+
+def _parse_created_at(created_at_str: str) -> Optional[datetime]:
+    """ISO 형식 작성 시각을 시간대 정보 없는 datetime으로 변환합니다 (비어 있으면 None)."""
+    if not created_at_str:
+        return None
+    # 'Z'로 끝날 때만 치환해 불필요한 문자열 복사를 피함
+    if created_at_str.endswith('Z'):
+        created_at_str = created_at_str[:-1] + '+00:00'
+    return datetime.fromisoformat(created_at_str).replace(tzinfo=None)
+
 class ReportScheduler:
     def __init__(self, config: Config, target_channels: List, embed_builder):
         """리포트 스케줄러를 초기화합니다."""
@@ -21,6 +54,10 @@ class ReportScheduler:
         self.embed_builder = embed_builder
         self.ai_summarizer = AISummarizer(config.GEMINI_API_KEY)
         self.report_builder = ReportBuilder()
+        # 리포트마다 세션을 새로 열지 않도록 시장 데이터 수집기를 재사용 (실패 시 쓰는 메모리 캐시도 유지됨)
+        self.market_collector = MarketDataCollector()
+        # Community API 요청용 공유 세션 (처음 사용할 때 생성)
+        self._session = None
         
     def start_scheduler(self):
         """리포트 스케줄러를 시작합니다."""
@@ -34,10 +71,29 @@ class ReportScheduler:
             self.generate_report.stop()
             logger.info("리포트 스케줄러가 중지되었습니다.")
     
+    async def close(self):
+        """스케줄러를 중지하고 Community API/시장 데이터 세션을 닫습니다."""
+        self.stop_scheduler()
+        if self._session:
+            await self._session.close()
+            self._session = None
+        await self.market_collector.close()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """리포트마다 다시 만들지 않도록 공유 세션을 반환합니다."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+    
     @tasks.loop(seconds=Config.REPORT_INTERVAL)
     async def generate_report(self):
         """1시간마다 Community 뉴스를 수집하고 AI 리포트를 생성합니다."""
         try:
+            # 받을 채널이 없으면 뉴스 수집/시장 데이터/AI 요약을 모두 건너뜀
+            if not self.target_channels:
+                logger.info("리포트를 받을 채널이 없어 리포트 생성을 건너뜁니다.")
+                return
+            
             logger.info("1시간 주기 리포트 생성을 시작합니다.")
             
             # Community API에서 최근 뉴스 수집
@@ -47,12 +103,16 @@ class ReportScheduler:
                 logger.info("리포트용 뉴스가 없습니다.")
                 return
             
+            if len(community_news) < self.config.REPORT_MIN_NEWS:
+                logger.info(f"리포트용 뉴스가 {len(community_news)}개로 최소 개수({self.config.REPORT_MIN_NEWS}개)보다 적어 리포트를 건너뜁니다.")
+                return
+            
             logger.info(f"리포트용 뉴스 {len(community_news)}개를 수집했습니다.")
             
             # 시장 데이터 수집 (나스닥 주가, 공포탐욕지수)
-            async with MarketDataCollector() as market_collector:
-                market_data = await market_collector.get_market_summary()
-                logger.info("시장 데이터 수집 완료")
+            await self.market_collector.open()
+            market_data = await self.market_collector.get_market_summary()
+            logger.info("시장 데이터 수집 완료")
             
             # AI 요약 생성 (시장 데이터 포함)
             summary = await self.ai_summarizer.summarize_news_with_market_data(community_news, market_data)
@@ -72,14 +132,18 @@ class ReportScheduler:
             # 리포트 임베드 생성 (시장 데이터 + 주요 헤드라인 포함)
             report_embed = self.report_builder.create_report_embed(summary, len(community_news), market_data, headlines)
             
-            # 모든 타겟 채널에 리포트 전송
-            for channel in self.target_channels:
-                try:
-                    await channel.send(embed=report_embed)
-                    logger.info(f"리포트를 {channel.name}에 전송했습니다.")
-                    await asyncio.sleep(1)  # API 제한 방지
-                except Exception as e:
-                    logger.error(f"리포트 전송 실패 ({channel.name}): {e}")
+            # 모든 타겟 채널에 리포트 전송 (채널 간에는 순서가 없으므로 동시에 전송)
+            semaphore = asyncio.Semaphore(REPORT_SEND_CONCURRENCY)
+            
+            async def send_report(channel):
+                async with semaphore:
+                    try:
+                        await channel.send(embed=report_embed)
+                        logger.info(f"리포트를 {channel.name}에 전송했습니다.")
+                    except Exception as e:
+                        logger.error(f"리포트 전송 실패 ({channel.name}): {e}")
+            
+            await asyncio.gather(*(send_report(channel) for channel in self.target_channels))
                     
         except Exception as e:
             logger.error(f"리포트 생성 중 오류 발생: {e}")
@@ -87,79 +151,75 @@ class ReportScheduler:
     async def _fetch_community_news_for_report(self) -> List[Dict]:
         """Community API에서 리포트용 뉴스를 수집합니다."""
         try:
-            async with aiohttp.ClientSession() as session:
-                # 최근 뉴스 수집을 위해 더 많은 데이터를 가져와서 필터링
-                # page_size가 너무 크면 API에서 422 오류가 발생할 수 있으므로 제한
-                max_page_size = min(self.config.REPORT_PAGE_SIZE * 2, 100)  # 최대 100개로 제한
-                params = {
-                    'page': 1,
-                    'page_size': max_page_size,
-                    'category': 'user_news',
-                    'sort': 'created_at_desc',
-                    'search': ''
-                }
-                
-                async with session.get(self.config.API_URL, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        posts = data.get('posts', [])
-                        
-                        # 뉴스 중복 방지 및 최신 뉴스 우선순위 적용
-                        filtered_news = self._filter_and_prioritize_news(posts)
-                        
-                        logger.info(f"필터링된 뉴스 {len(filtered_news)}개를 수집했습니다.")
-                        return filtered_news
-                    elif response.status == 422:
-                        # 422 오류 시 page_size를 줄여서 재시도
-                        logger.warning(f"HTTP 422 오류 발생, page_size를 줄여서 재시도합니다.")
-                        fallback_params = params.copy()
-                        fallback_params['page_size'] = 50  # 더 작은 값으로 재시도
-                        
-                        async with session.get(self.config.API_URL, params=fallback_params) as fallback_response:
-                            if fallback_response.status == 200:
-                                data = await fallback_response.json()
-                                posts = data.get('posts', [])
-                                filtered_news = self._filter_and_prioritize_news(posts)
-                                logger.info(f"재시도 성공: 필터링된 뉴스 {len(filtered_news)}개를 수집했습니다.")
-                                return filtered_news
-                            else:
-                                error_text = await fallback_response.text()
-                                logger.error(f"재시도도 실패: HTTP {fallback_response.status}")
-                                logger.error(f"API 응답: {error_text}")
-                                return []
-                    else:
-                        # 더 자세한 오류 정보 로깅
-                        error_text = await response.text()
-                        logger.error(f"Community API 호출 실패: HTTP {response.status}")
-                        logger.error(f"API 응답: {error_text}")
-                        logger.error(f"요청 파라미터: {params}")
-                        return []
-                        
+            session = await self._get_session()
+            # 최근 뉴스 수집을 위해 더 많은 데이터를 가져와서 필터링
+            # page_size가 너무 크면 API에서 422 오류가 발생할 수 있으므로 제한
+            max_page_size = min(self.config.REPORT_PAGE_SIZE * 2, 100)  # 최대 100개로 제한
+            params = {
+                'page': 1,
+                'page_size': max_page_size,
+                'category': 'user_news',
+                'sort': 'created_at_desc',
+                'search': ''
+            }
+            
+            async with session.get(self.config.API_URL, params=params) as response:
+                if response.status == 200:
+                    data = json_utils.loads(await response.read())
+                    posts = data.get('posts', [])
+                    
+                    # 뉴스 중복 방지 및 최신 뉴스 우선순위 적용
+                    filtered_news = self._filter_and_prioritize_news(posts)
+                    
+                    logger.info(f"필터링된 뉴스 {len(filtered_news)}개를 수집했습니다.")
+                    return filtered_news
+                elif response.status == 422:
+                    # 422 오류 시 page_size를 줄여서 재시도
+                    logger.warning(f"HTTP 422 오류 발생, page_size를 줄여서 재시도합니다.")
+                    fallback_params = params.copy()
+                    fallback_params['page_size'] = 50  # 더 작은 값으로 재시도
+                    
+                    async with session.get(self.config.API_URL, params=fallback_params) as fallback_response:
+                        if fallback_response.status == 200:
+                            data = json_utils.loads(await fallback_response.read())
+                            posts = data.get('posts', [])
+                            filtered_news = self._filter_and_prioritize_news(posts)
+                            logger.info(f"재시도 성공: 필터링된 뉴스 {len(filtered_news)}개를 수집했습니다.")
+                            return filtered_news
+                        else:
+                            error_text = await fallback_response.text()
+                            logger.error(f"재시도도 실패: HTTP {fallback_response.status}")
+                            logger.error(f"API 응답: {error_text}")
+                            return []
+                else:
+                    # 더 자세한 오류 정보 로깅
+                    error_text = await response.text()
+                    logger.error(f"Community API 호출 실패: HTTP {response.status}")
+                    logger.error(f"API 응답: {error_text}")
+                    logger.error(f"요청 파라미터: {params}")
+                    return []
+                    
         except Exception as e:
             logger.error(f"Community 뉴스 수집 중 오류 발생: {e}")
             return []
     
     def _filter_and_prioritize_news(self, posts: List[Dict]) -> List[Dict]:
         """뉴스를 필터링하고 우선순위를 적용합니다."""
-        from datetime import datetime, timedelta
-        import re
-        
+        # 현재 시각은 한 번만 구해 모든 뉴스에 사용
+        now = datetime.now()
         # 최근 2시간 내 뉴스만 고려 (더 넓은 범위에서 최신 뉴스 선별)
-        cutoff_time = datetime.now() - timedelta(hours=2)
+        cutoff_time = now - timedelta(hours=2)
         
         filtered_posts = []
         seen_titles = set()  # 제목 기반 중복 방지
-        seen_content_hashes = set()  # 내용 기반 중복 방지
+        seen_contents = set()  # 내용 기반 중복 방지 (첫 100자)
         
         for post in posts:
             try:
-                # 시간 필터링
-                created_at_str = post.get('created_at', '')
-                if created_at_str:
-                    # ISO 형식 시간 파싱
-                    created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                    if created_at.replace(tzinfo=None) < cutoff_time:
-                        continue
+                # 시간 필터링 (파싱한 시각은 중요도 점수 계산에도 재사용)
+                created_at = _parse_created_at(post.get('created_at', ''))
+                if created_at and created_at < cutoff_time:
+                    continue
                 
                 # 제목 정규화 및 중복 체크
                 title = post.get('title', '').strip()
@@ -167,25 +227,24 @@ class ReportScheduler:
                     continue
                 
                 # 제목 정규화 (특수문자, 공백 정리)
-                normalized_title = re.sub(r'[^\w\s]', '', title.lower())
-                normalized_title = re.sub(r'\s+', ' ', normalized_title).strip()
+                normalized_title = _PUNCTUATION_PATTERN.sub('', title.lower())
+                normalized_title = ' '.join(normalized_title.split())
                 
                 if normalized_title in seen_titles:
                     continue
                 
-                # 내용 기반 중복 체크 (첫 100자 해시)
-                content = post.get('content', '')
-                content_hash = hash(content[:100]) if content else 0
-                if content_hash in seen_content_hashes:
+                # 내용 기반 중복 체크 (첫 100자를 그대로 키로 사용해 해시 충돌로 잘못 거르지 않음)
+                content_key = (post.get('content') or '')[:100]
+                if content_key in seen_contents:
                     continue
                 
                 # 중요도 점수 계산
-                importance_score = self._calculate_importance_score(post)
+                importance_score = self._calculate_importance_score(post, now, created_at)
                 post['_importance_score'] = importance_score
                 
                 filtered_posts.append(post)
                 seen_titles.add(normalized_title)
-                seen_content_hashes.add(content_hash)
+                seen_contents.add(content_key)
                 
                 # 최대 개수 제한
                 if len(filtered_posts) >= self.config.REPORT_PAGE_SIZE:
@@ -196,16 +255,17 @@ class ReportScheduler:
                 continue
         
         # 중요도 점수 기준으로 정렬 (높은 점수 우선)
-        filtered_posts.sort(key=lambda x: x.get('_importance_score', 0), reverse=True)
+        # (위에서 모든 뉴스에 _importance_score를 채우므로 바로 꺼내 씀)
+        filtered_posts.sort(key=itemgetter('_importance_score'), reverse=True)
         
         return filtered_posts[:self.config.REPORT_PAGE_SIZE]
     
-    def _calculate_importance_score(self, post: Dict) -> int:
-        """뉴스의 중요도 점수를 계산합니다."""
+    def _calculate_importance_score(self, post: Dict, now: Optional[datetime] = None, created_at: Optional[datetime] = None) -> int:
+        """뉴스의 중요도 점수를 계산합니다 (now를 주지 않으면 현재 시각 기준, created_at을 주지 않으면 post에서 파싱)."""
         score = 0
         
         # 좋아요 수 (가중치 높음)
-        like_count = post.get('like_stats', {}).get('like_count', 0)
+        like_count = get_like_count(post)
         score += like_count * 3
         
         # 조회수
@@ -217,28 +277,20 @@ class ReportScheduler:
         score += comment_count * 2
         
         # 제목에 중요한 키워드가 있는지 확인
+        # 포함된 키워드 종류마다 10점 (같은 키워드가 여러 번 나와도 한 번만)
         title = post.get('title', '').lower()
-        important_keywords = [
-            '속보', '긴급', '중요', '특보', '급등', '급락', '폭등', '폭락',
-            'ai', '반도체', '테슬라', '애플', '구글', '마이크로소프트', '아마존',
-            'nvidia', 'amd', '인텔', '삼성', 'sk하이닉스', 'lg', '현대차',
-            'fed', '연준', '금리', '인플레이션', 'gdp', '고용지표'
-        ]
-        
-        for keyword in important_keywords:
-            if keyword in title:
-                score += 10
+        score += 10 * len(set(_IMPORTANT_KEYWORDS_PATTERN.findall(title)))
         
         # 최근성 보너스 (최근 30분 내면 보너스)
         try:
-            created_at_str = post.get('created_at', '')
-            if created_at_str:
-                created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                time_diff = datetime.now() - created_at.replace(tzinfo=None)
-                if time_diff.total_seconds() < 1800:  # 30분
-                    score += 20
-        except:
-            pass
+            if created_at is None:
+                created_at = _parse_created_at(post.get('created_at', ''))
+            # timedelta끼리 바로 비교 (total_seconds 변환 없이)
+            if created_at and (now or datetime.now()) - created_at < RECENT_BONUS_WINDOW:
+                score += 20
+        except (AttributeError, TypeError, ValueError) as e:
+            # 작성 시각 형식이 잘못된 뉴스는 보너스 없이 점수 계산
+            logger.debug(f"작성 시각 파싱 실패로 최근성 보너스 제외: {e}")
         
         return score
     
@@ -1,29 +1,92 @@
 import aiohttp
 import asyncio
-from typing import List, Dict, Optional
+import hashlib
+from typing import List, Dict, Optional, Sequence, Tuple
 import logging
 import re
+import time
+from collections import OrderedDict
+
+from core import json_utils
 
 logger = logging.getLogger(__name__)
 
+# 같은 요청에 대해 네트워크 호출 없이 캐시를 재사용하는 시간 (초)
+# 폴링 간격(UPDATE_INTERVAL)보다 짧게 유지해야 새 뉴스 감지가 늦어지지 않음
+RESPONSE_CACHE_TTL = 5
+
+# 폴링 간에 재사용하는 뉴스 ID별 속보 판단 결과 개수 상한
+BREAKING_CACHE_MAX_ENTRIES = 10000
+
+# 키워드와 함께 확인하는 속보 패턴 (예: [속보], [긴급] 등)
+BREAKING_PATTERNS = [
+    r'\[속보\]', r'\[긴급\]', r'\[중요\]', r'\[특보\]',
+    r'속보:', r'긴급:', r'중요:', r'특보:',
+    r'🚨', r'⚡', r'🔥'
+]
+
 class NewsAPIClient:
-    def __init__(self, community_api_url: str, news_api_url: str, page_size: int = 20, breaking_keywords: List[str] = None):
+    def __init__(self, community_api_url: str, news_api_url: str, page_size: int = 20, breaking_keywords: Sequence[str] = None):
         self.community_api_url = community_api_url
         self.news_api_url = news_api_url
         self.page_size = page_size
         self.breaking_keywords = breaking_keywords or ['속보', '긴급', '중요', '특보', '긴급속보', '특별속보']
         self.session = None
+        # (URL, 파라미터)별 마지막 응답 캐시 (조건부 GET 및 짧은 TTL 재사용)
+        self._response_cache: Dict[tuple, Dict] = {}
+        # 페이지별로 진행 중인 fetch_news 작업 (동시 호출 시 같은 결과를 공유)
+        self._inflight: Dict[int, asyncio.Task] = {}
+        # (출처, ID, 제목) -> 속보 여부. 매 폴링마다 새로 파싱되는 같은 뉴스를 다시 검사하지 않도록 보관
+        self._breaking_cache: OrderedDict = OrderedDict()
+        # 속보 키워드와 특정 패턴을 하나의 정규식으로 미리 컴파일
+        self._breaking_re = re.compile(
+            '|'.join([re.escape(keyword) for keyword in self.breaking_keywords if keyword] + BREAKING_PATTERNS),
+            re.IGNORECASE
+        )
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        await self.open()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def open(self):
+        """keep-alive 연결 풀을 사용하는 세션을 엽니다 (여러 번 호출해도 한 번만 생성)."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=20, limit_per_host=8, keepalive_timeout=60, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Accept-Encoding': 'gzip, deflate'},
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+    
+    async def close(self):
+        """세션을 닫습니다."""
         if self.session:
             await self.session.close()
+            self.session = None
     
     async def fetch_news(self, page: int = 1) -> Optional[Dict]:
-        """뉴스 데이터를 두 개의 API에서 가져와서 병합합니다."""
+        """뉴스 데이터를 두 개의 API에서 가져와서 병합합니다.
+
+        같은 페이지에 대한 요청이 이미 진행 중이면 새로 요청하지 않고 그 결과를 함께 기다립니다.
+        """
+        task = self._inflight.get(page)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_merge(page))
+            self._inflight[page] = task
+            task.add_done_callback(lambda done, page=page: self._clear_inflight(page, done))
+        # 한 호출자가 취소되어도 공유 작업은 계속 진행되도록 shield 사용
+        return await asyncio.shield(task)
+    
+    def _clear_inflight(self, page: int, task: asyncio.Task):
+        """완료된 페이지 요청 작업을 정리합니다 (그사이 새로 등록된 작업은 지우지 않음)."""
+        if self._inflight.get(page) is task:
+            del self._inflight[page]
+    
+    async def _fetch_and_merge(self, page: int) -> Optional[Dict]:
+        """두 API를 병렬로 호출하고 ID 기준으로 중복을 제거해 병합합니다."""
         try:
             # 두 API에서 데이터를 병렬로 가져오기
             community_data, news_data = await asyncio.gather(
@@ -32,46 +95,46 @@ class NewsAPIClient:
                 return_exceptions=True
             )
             
-            # 결과 병합
-            merged_posts = []
+            # 결과 병합 (ID 기준 중복 제거를 같은 순회에서 처리, dict는 삽입 순서 유지)
+            unique = {}
+            sources = []
             
-            # Community API 결과 처리 (리스트를 뒤에서부터 읽어오기)
+            # Community API 결과 처리
             if isinstance(community_data, dict) and 'posts' in community_data:
                 community_posts = community_data['posts']
-                # 리스트를 뒤에서부터 읽어서 최신 뉴스가 앞에 오도록 함
-                for post in reversed(community_posts):
-                    # Community API에서 온 뉴스임을 표시
-                    post['_source_api'] = 'community'
-                    merged_posts.append(post)
+                sources.append((community_posts, 'community'))
                 logger.info(f"Community API: {len(community_posts)}개 뉴스 수신")
             
-            # News API 결과 처리 (리스트를 뒤에서부터 읽어오기)
+            # News API 결과 처리
             if isinstance(news_data, dict) and 'news_list' in news_data:
                 news_posts = news_data['news_list']
-                # 리스트를 뒤에서부터 읽어서 최신 뉴스가 앞에 오도록 함
-                for post in reversed(news_posts):
-                    # News API에서 온 뉴스임을 표시
-                    post['_source_api'] = 'news'
-                    merged_posts.append(post)
+                sources.append((news_posts, 'news'))
                 logger.info(f"News API: {len(news_posts)}개 뉴스 수신")
             
-            # 중복 제거 (ID 기준) - 이미 시간순으로 정렬된 상태에서 중복 제거
-            seen_ids = set()
-            unique_posts = []
-            for post in merged_posts:
-                post_id = post.get('id')
-                if post_id and post_id not in seen_ids:
-                    seen_ids.add(post_id)
-                    unique_posts.append(post)
+            for posts, source_api in sources:
+                # 리스트를 뒤에서부터 읽어서 최신 뉴스가 앞에 오도록 함
+                for post in reversed(posts):
+                    post_id = post.get('id')
+                    if post_id and post_id not in unique:
+                        # 어느 API에서 온 뉴스인지 표시
+                        post['_source_api'] = source_api
+                        unique[post_id] = post
+            unique_posts = list(unique.values())
             
             logger.info(f"병합 완료: 총 {len(unique_posts)}개 고유 뉴스")
             
+            # 두 API 원본 응답이 모두 있을 때만 응답 지문을 만듦
+            raw_fingerprint = None
+            if isinstance(community_data, dict) and isinstance(news_data, dict):
+                raw_fingerprint = (community_data.get('_raw_digest'), news_data.get('_raw_digest'))
+            
             return {
                 'posts': unique_posts,
                 'total_count': len(unique_posts),
                 'page': page,
                 'page_size': self.page_size,
-                'from_cache': False
+                'from_cache': False,
+                'raw_fingerprint': raw_fingerprint
             }
                     
         except Exception as e:
@@ -89,16 +152,15 @@ class NewsAPIClient:
                 'search': ''
             }
             
-            async with self.session.get(self.community_api_url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    # 더 자세한 오류 정보 로깅
-                    error_text = await response.text()
-                    logger.error(f"Community API 호출 실패: HTTP {response.status}")
-                    logger.error(f"API 응답: {error_text}")
-                    logger.error(f"요청 파라미터: {params}")
-                    return None
+            status, data, error_text = await self._get_json(self.community_api_url, params)
+            if data is not None:
+                return data
+            else:
+                # 더 자세한 오류 정보 로깅
+                logger.error(f"Community API 호출 실패: HTTP {status}")
+                logger.error(f"API 응답: {error_text}")
+                logger.error(f"요청 파라미터: {params}")
+                return None
                     
         except Exception as e:
             logger.error(f"Community API 호출 중 오류 발생: {e}")
@@ -113,57 +175,103 @@ class NewsAPIClient:
                 'sort': 'created_at_desc'
             }
             
-            async with self.session.get(self.news_api_url, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"News API 호출 실패: HTTP {response.status}")
-                    return None
+            status, data, _ = await self._get_json(self.news_api_url, params)
+            if data is not None:
+                return data
+            else:
+                logger.error(f"News API 호출 실패: HTTP {status}")
+                return None
                     
         except Exception as e:
             logger.error(f"News API 호출 중 오류 발생: {e}")
             return None
     
+    async def _get_json(self, url: str, params: Dict) -> Tuple[int, Optional[Dict], Optional[str]]:
+        """조건부 GET(ETag/Last-Modified)과 짧은 TTL 캐시를 적용해 JSON을 가져옵니다.
+        
+        (HTTP 상태, JSON 데이터, 오류 응답 본문)을 반환하며 실패 시 데이터는 None입니다.
+        """
+        key = (url, tuple(sorted(params.items())))
+        cached = self._response_cache.get(key)
+        now = time.monotonic()
+        
+        # TTL 안이면 네트워크 요청 없이 캐시 반환
+        if cached and now < cached['expires_at']:
+            return 200, cached['data'], None
+        
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        async with self.session.get(url, params=params, headers=headers) as response:
+            # 변경 없음: 본문 없이 캐시된 데이터를 재사용
+            if response.status == 304 and cached:
+                cached['expires_at'] = now + RESPONSE_CACHE_TTL
+                return 304, cached['data'], None
+            if response.status == 200:
+                body = await response.read()
+                data = json_utils.loads(body)
+                # 원본 바이트의 지문 (변경 감지 시 파싱된 뉴스를 다시 직렬화/해시하지 않도록 사용)
+                data['_raw_digest'] = hashlib.blake2b(body, digest_size=16).digest()
+                self._response_cache[key] = {
+                    'data': data,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'expires_at': now + RESPONSE_CACHE_TTL,
+                }
+                return 200, data, None
+            return response.status, None, await response.text()
+    
     def get_news_list(self, data: Dict) -> List[Dict]:
         """API 응답에서 뉴스 리스트를 추출합니다."""
         return data.get('posts', [])
     
     def is_breaking_news(self, news: Dict) -> bool:
-        """뉴스가 속보인지 판단합니다."""
+        """뉴스가 속보인지 판단합니다 (결과는 news['_is_breaking']와 뉴스 ID별 캐시에 저장)."""
+        cached = news.get('_is_breaking')
+        if cached is not None:
+            return cached
+        
+        news_id = news.get('id')
+        # 제목/내용/태그 중 하나라도 수정되면 다시 판단하도록 모두 키에 포함
+        # (내용은 길 수 있으므로 문자열 대신 해시값만 저장)
+        key = (
+            news.get('_source_api'), news_id, news.get('title'), hash(news.get('content')),
+            tuple(news.get('community_tags') or ()), tuple(news.get('tag_names') or ()),
+        ) if news_id else None
+        result = self._breaking_cache.get(key) if key else None
+        if result is None:
+            result = self._scan_breaking_news(news)
+            if key:
+                self._breaking_cache[key] = result
+                if len(self._breaking_cache) > BREAKING_CACHE_MAX_ENTRIES:
+                    self._breaking_cache.popitem(last=False)
+        else:
+            self._breaking_cache.move_to_end(key)
+        news['_is_breaking'] = result
+        return result
+    
+    def _scan_breaking_news(self, news: Dict) -> bool:
+        """제목/내용/태그를 검사하여 속보 여부를 계산합니다."""
         title = news.get('title', '')
         content = news.get('content', '')
         community_tags = news.get('community_tags', [])
         tag_names = news.get('tag_names', [])  # News API의 태그 구조
+        search = self._breaking_re.search
         
-        # 제목에서 속보 키워드 확인
-        for keyword in self.breaking_keywords:
-            if keyword in title:
-                return True
-        
-        # 내용에서 속보 키워드 확인
-        for keyword in self.breaking_keywords:
-            if keyword in content:
-                return True
+        # 제목/내용에서 속보 키워드 및 패턴 확인 (예: [속보], 🚨)
+        if search(title) or search(content):
+            return True
         
-        # 커뮤니티 태그에서 속보 관련 태그 확인 (Community API)
+        # 커뮤니티 태그(Community API)와 태그 이름(News API)에서 속보 관련 태그 확인
         for tag in community_tags:
-            if any(keyword in tag for keyword in self.breaking_keywords):
+            if search(tag):
                 return True
-        
-        # 태그 이름에서 속보 관련 태그 확인 (News API)
         for tag in tag_names:
-            if any(keyword in tag for keyword in self.breaking_keywords):
-                return True
-        
-        # 특정 패턴 확인 (예: [속보], [긴급] 등)
-        breaking_patterns = [
-            r'\[속보\]', r'\[긴급\]', r'\[중요\]', r'\[특보\]',
-            r'속보:', r'긴급:', r'중요:', r'특보:',
-            r'🚨', r'⚡', r'🔥'
-        ]
-        
-        for pattern in breaking_patterns:
-            if re.search(pattern, title, re.IGNORECASE) or re.search(pattern, content, re.IGNORECASE):
+            if search(tag):
                 return True
         
         return False
@@ -1,12 +1,27 @@
-import json
+import asyncio
+import atexit
 import os
 import hashlib
+import shutil
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 import logging
 
+from core import json_utils
+
 logger = logging.getLogger(__name__)
 
+# 변경은 메모리에 모아 두었다가 새 뉴스 ID가 이만큼 쌓이거나
+# 첫 변경 후 이 시간(초)이 지나면 한 번에 파일에 저장
+CACHE_FLUSH_MAX_PENDING = 50
+CACHE_FLUSH_MAX_DELAY = 30
+# 기억할 처리 뉴스 ID 최대 개수 (넘으면 가장 오래된 ID부터 잊음)
+# API는 최근 페이지만 돌려주므로 오래전 ID가 다시 나타나지 않아 이 정도면 충분함
+NEWS_IDS_MAX_ENTRIES = 20000
+
 class NewsCacheManager:
     """뉴스 데이터를 파일로 저장하고 비교하는 캐시 관리자"""
     
@@ -14,6 +29,14 @@ class NewsCacheManager:
         self.cache_dir = cache_dir
         self.news_cache_file = os.path.join(cache_dir, "news_cache.json")
         self.last_response_file = os.path.join(cache_dir, "last_response.json")
+        # 처리한 뉴스 ID는 전체를 다시 쓰지 않도록 추가 전용 로그에 한 줄씩 기록
+        self.news_ids_log_file = os.path.join(cache_dir, "news_ids.log")
+        
+        # 파일 쓰기는 작업 스레드에서도 실행되므로 같은 파일(임시 파일 포함)을 동시에 쓰지 않도록 직렬화
+        self._write_lock = threading.Lock()
+        # 비동기 저장은 준비(_prepare_writes)한 순서대로 쓰이도록 한 번에 하나씩만 실행
+        # (폴링의 maybe_flush와 backup_cache_async가 겹쳐도 오래된 내용이 새 내용을 덮지 않음)
+        self._flush_lock = asyncio.Lock()
         
         # 캐시 디렉토리 생성
         os.makedirs(cache_dir, exist_ok=True)
@@ -21,20 +44,53 @@ class NewsCacheManager:
         # 기존 캐시 로드
         self.news_cache = self._load_news_cache()
         self.last_response = self._load_last_response()
+        
+        # 파일 쓰기를 모아서 하기 위한 변경 표시 (flush/maybe_flush에서 저장, 폴링마다 NewsHandler가 호출)
+        self._news_cache_dirty = False
+        self._last_response_dirty = False
+        # 저장하지 않은 첫 변경이 생긴 시각 (없으면 None)
+        self._dirty_since = None
+        # 마지막으로 확인한 API 원본 응답 지문 (같으면 뉴스 내용 해시를 건너뜀)
+        self._last_raw_fingerprint = None
+        # 마지막으로 확인한 응답의 뉴스 ID 순서 (같으면 내용 해시를 건너뜀)
+        self._last_response_ids = None
+        
+        # 로그에 아직 기록하지 않은 새 뉴스 ID
+        self._pending_news_ids = []
+        self._news_ids_log_lines = 0
+        self._news_ids_log_broken = False
+        # 처리한 뉴스 ID를 들어온 순서대로 보관 (오래된 ID부터 잊기 위해 사용)
+        self._news_ids_order = deque()
+        legacy_ids = self.news_cache['news_ids']
+        self.news_cache['news_ids'] = self._load_news_ids_log()
+        new_legacy_ids = legacy_ids - self.news_cache['news_ids']
+        if new_legacy_ids:
+            # 이전 형식(news_cache.json에 전체 ID 저장)에서 옮겨 옴
+            self.news_cache['news_ids'].update(new_legacy_ids)
+            self._news_ids_order.extendleft(new_legacy_ids)
+            self._trim_news_ids()
+            self._compact_news_ids_log()
+            self._mark_dirty(news_cache=True)
+        elif self._news_ids_log_broken or self._trim_news_ids():
+            # 잘린 줄 뒤에 이어 쓰지 않도록, 또는 잊은 ID를 빼도록 정상 ID만으로 다시 씀
+            self._compact_news_ids_log()
+        logger.info(f"뉴스 ID 로드 완료: {len(self.news_cache['news_ids'])}개 뉴스")
+        # 종료 시 아직 저장하지 않은 변경을 기록
+        atexit.register(self.flush)
     
     def _load_news_cache(self) -> Dict:
         """뉴스 캐시 파일을 로드합니다."""
         try:
             if os.path.exists(self.news_cache_file):
-                with open(self.news_cache_file, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
+                with open(self.news_cache_file, 'rb') as f:
+                    cache = json_utils.loads(f.read())
                     # JSON에서 로드된 list를 set으로 변환
                     news_ids_list = cache.get('news_ids', [])
                     cache['news_ids'] = set(news_ids_list)
                     # 요약형 전송 ID 세트 복원
                     sent_summary_ids_list = cache.get('sent_summary_ids', [])
                     cache['sent_summary_ids'] = set(sent_summary_ids_list)
-                    logger.info(f"뉴스 캐시 로드 완료: {len(cache['news_ids'])}개 뉴스")
+                    logger.info("뉴스 캐시 로드 완료")
                     return cache
         except Exception as e:
             logger.error(f"뉴스 캐시 로드 실패: {e}")
@@ -46,12 +102,58 @@ class NewsCacheManager:
             "sent_summary_ids": set()
         }
     
+    def _load_news_ids_log(self) -> Set:
+        """추가 전용 로그에서 처리한 뉴스 ID를 읽습니다 (한 줄에 JSON 값 하나)."""
+        news_ids = set()
+        try:
+            if os.path.exists(self.news_ids_log_file):
+                with open(self.news_ids_log_file, 'rb') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            news_id = json_utils.loads(line)
+                        except ValueError:
+                            # 기록 도중 종료되어 잘린 줄은 건너뜀
+                            logger.warning(f"뉴스 ID 로그의 잘못된 줄을 건너뜁니다: {line[:50]!r}")
+                            self._news_ids_log_broken = True
+                            continue
+                        self._news_ids_log_lines += 1
+                        if news_id not in news_ids:
+                            news_ids.add(news_id)
+                            self._news_ids_order.append(news_id)
+        except Exception as e:
+            logger.error(f"뉴스 ID 로그 로드 실패: {e}")
+        return news_ids
+    
+    @staticmethod
+    def _encode_news_ids(news_ids) -> bytes:
+        """뉴스 ID들을 로그 형식(한 줄에 JSON 값 하나)의 bytes 하나로 만듭니다."""
+        return b''.join(json_utils.dumps_bytes(news_id) + b'\n' for news_id in news_ids)
+    
+    def _compact_news_ids_log(self):
+        """현재 ID 집합만으로 로그 파일을 다시 씁니다."""
+        self._pending_news_ids = []
+        self._news_ids_log_lines = len(self._news_ids_order)
+        self._write_files([(self.news_ids_log_file, self._encode_news_ids(self._news_ids_order), False)])
+    
+    def _trim_news_ids(self) -> bool:
+        """ID가 NEWS_IDS_MAX_ENTRIES를 넘으면 오래된 것부터 잊고, 잊은 ID가 있었는지 반환합니다."""
+        news_ids = self.news_cache['news_ids']
+        order = self._news_ids_order
+        if len(order) <= NEWS_IDS_MAX_ENTRIES:
+            return False
+        while len(order) > NEWS_IDS_MAX_ENTRIES:
+            news_ids.discard(order.popleft())
+        return True
+    
     def _load_last_response(self) -> Dict:
         """마지막 API 응답을 로드합니다."""
         try:
             if os.path.exists(self.last_response_file):
-                with open(self.last_response_file, 'r', encoding='utf-8') as f:
-                    response = json.load(f)
+                with open(self.last_response_file, 'rb') as f:
+                    response = json_utils.loads(f.read())
                     logger.info(f"마지막 API 응답 로드 완료: {response.get('timestamp', 'Unknown')}")
                     return response
         except Exception as e:
@@ -63,49 +165,74 @@ class NewsCacheManager:
             "news_count": 0
         }
     
-    def _save_news_cache(self):
-        """뉴스 캐시를 파일에 저장합니다."""
-        try:
+    def _prepare_writes(self) -> List[Tuple[str, bytes, bool]]:
+        """저장할 변경을 (경로, 내용, 이어쓰기 여부) 목록으로 만들고 변경 표시를 지웁니다.
+
+        캐시 데이터의 직렬화는 호출한 쪽(이벤트 루프)에서 끝내므로, 실제 파일 쓰기는
+        다른 스레드에서 해도 캐시가 동시에 바뀌는 문제가 없습니다.
+        """
+        writes = []
+        self._dirty_since = None
+        
+        if self._news_cache_dirty:
+            self._news_cache_dirty = False
+            
+            # 뉴스 ID는 news_ids.log에 추가분만 기록
+            if self._pending_news_ids:
+                self._news_ids_log_lines += len(self._pending_news_ids)
+                trimmed = self._trim_news_ids()
+                if trimmed or self._news_ids_log_lines > 2 * len(self._news_ids_order):
+                    # 오래된 ID를 잊었거나 중복 줄이 많이 쌓이면 (현재 ID 수의 2배 초과) 로그를 다시 씀
+                    self._news_ids_log_lines = len(self._news_ids_order)
+                    writes.append((self.news_ids_log_file, self._encode_news_ids(self._news_ids_order), False))
+                else:
+                    writes.append((self.news_ids_log_file, self._encode_news_ids(self._pending_news_ids), True))
+                self._pending_news_ids = []
+            
             # set을 list로 변환 (JSON 직렬화를 위해)
             cache_to_save = self.news_cache.copy()
-            cache_to_save["news_ids"] = list(cache_to_save["news_ids"])
+            del cache_to_save["news_ids"]
             cache_to_save["sent_summary_ids"] = list(cache_to_save.get("sent_summary_ids", set()))
-            
-            with open(self.news_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_to_save, f, ensure_ascii=False, indent=2)
-            logger.info(f"뉴스 캐시 저장 완료: {len(self.news_cache['news_ids'])}개 뉴스")
-        except Exception as e:
-            logger.error(f"뉴스 캐시 저장 실패: {e}")
+            writes.append((self.news_cache_file, json_utils.dumps_line(cache_to_save), False))
+        
+        if self._last_response_dirty:
+            self._last_response_dirty = False
+            writes.append((self.last_response_file, json_utils.dumps_line(self.last_response), False))
+        
+        return writes
     
-    def _save_last_response(self, response_data: Dict):
-        """마지막 API 응답을 파일에 저장합니다."""
-        try:
-            with open(self.last_response_file, 'w', encoding='utf-8') as f:
-                json.dump(response_data, f, ensure_ascii=False, indent=2)
-            logger.info(f"마지막 API 응답 저장 완료: {response_data.get('timestamp', 'Unknown')}")
-        except Exception as e:
-            logger.error(f"마지막 API 응답 저장 실패: {e}")
+    def _write_files(self, writes: List[Tuple[str, bytes, bool]]):
+        """준비된 내용을 파일에 씁니다 (이어쓰기는 write 한 번, 나머지는 임시 파일에 쓴 뒤 교체)."""
+        with self._write_lock:
+            for path, data, append in writes:
+                try:
+                    if append:
+                        with open(path, 'ab', buffering=0) as f:
+                            f.write(data)
+                    else:
+                        tmp_path = path + ".tmp"
+                        with open(tmp_path, 'wb') as f:
+                            f.write(data)
+                        os.replace(tmp_path, path)
+                except Exception as e:
+                    logger.error(f"캐시 파일 저장 실패 ({path}): {e}")
+        if writes:
+            logger.info(f"캐시 파일 저장 완료: {len(writes)}개 파일")
     
     def _generate_response_hash(self, response_data: Dict) -> str:
         """API 응답 데이터의 해시를 생성합니다."""
         try:
-            # 뉴스 리스트만 추출하여 해시 생성
-            news_list = response_data.get('posts', [])
-            news_data = []
+            # 뉴스 리스트만 추출하여 해시 생성 (정렬하여 일관된 해시 생성)
+            news_list = sorted(response_data.get('posts', []), key=lambda news: str(news.get('id', '')))
             
+            # 전체를 하나의 큰 JSON으로 만들지 않고 뉴스별로 해시에 누적
+            # 보안용이 아닌 변경 감지용이므로 md5보다 빠른 blake2b 사용
+            hasher = hashlib.blake2b(digest_size=16)
             for news in news_list:
-                news_data.append({
-                    'id': news.get('id'),
-                    'title': news.get('title'),
-                    'content': news.get('content'),
-                    'created_at': news.get('created_at')
-                })
-            
-            # 정렬하여 일관된 해시 생성
-            news_data.sort(key=lambda x: x.get('id', ''))
-            
-            data_string = json.dumps(news_data, sort_keys=True, ensure_ascii=False)
-            return hashlib.md5(data_string.encode('utf-8')).hexdigest()
+                hasher.update(json_utils.dumps_bytes(
+                    (news.get('id'), news.get('title'), news.get('content'), news.get('created_at'))
+                ))
+            return hasher.hexdigest()
         except Exception as e:
             logger.error(f"응답 해시 생성 실패: {e}")
             return ""
@@ -116,21 +243,25 @@ class NewsCacheManager:
             current_news_list = current_response.get('posts', [])
             new_news = []
             
-            # news_ids가 set이 아닌 경우 set으로 변환
-            if not isinstance(self.news_cache['news_ids'], set):
-                self.news_cache['news_ids'] = set(self.news_cache['news_ids'])
-            
+            # 반복문 안의 dict/속성 조회를 줄이기 위해 미리 지역 변수로 꺼내 둠
+            news_ids = self.news_cache['news_ids']
+            add_id = news_ids.add
+            append_news = new_news.append
+            append_pending = self._pending_news_ids.append
+            append_order = self._news_ids_order.append
             for news in current_news_list:
                 news_id = news.get('id')
-                if news_id and news_id not in self.news_cache['news_ids']:
-                    new_news.append(news)
-                    self.news_cache['news_ids'].add(news_id)
-                    self.news_cache['total_processed'] += 1
+                if news_id and news_id not in news_ids:
+                    append_news(news)
+                    add_id(news_id)
+                    append_pending(news_id)
+                    append_order(news_id)
             
             # 새로운 뉴스가 있으면 캐시 업데이트
             if new_news:
+                self.news_cache['total_processed'] += len(new_news)
                 self.news_cache['last_update'] = datetime.now().isoformat()
-                self._save_news_cache()
+                self._mark_dirty(news_cache=True)
                 logger.info(f"새로운 뉴스 {len(new_news)}개 감지")
             
             return new_news
@@ -139,11 +270,57 @@ class NewsCacheManager:
             logger.error(f"새로운 뉴스 필터링 실패: {e}")
             return []
     
+    def _mark_dirty(self, news_cache: bool = False, last_response: bool = False):
+        """저장할 변경이 생겼음을 표시합니다."""
+        if news_cache:
+            self._news_cache_dirty = True
+        if last_response:
+            self._last_response_dirty = True
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+    
+    def _flush_due(self) -> bool:
+        """새 뉴스 ID가 충분히 쌓였거나 첫 변경 후 CACHE_FLUSH_MAX_DELAY가 지났는지 확인합니다."""
+        if self._dirty_since is None:
+            return False
+        return (len(self._pending_news_ids) >= CACHE_FLUSH_MAX_PENDING
+                or time.monotonic() - self._dirty_since >= CACHE_FLUSH_MAX_DELAY)
+    
+    def flush(self):
+        """저장하지 않은 변경이 있으면 즉시 파일에 저장합니다."""
+        self._write_files(self._prepare_writes())
+    
+    async def maybe_flush(self):
+        """저장 조건(_flush_due)을 만족하면 변경된 캐시를 저장합니다 (파일 쓰기는 이벤트 루프 밖에서 한 번에 수행)."""
+        if self._flush_due():
+            await self.flush_async()
+    
+    async def flush_async(self):
+        """flush와 같지만 파일 쓰기를 스레드에서 실행해 이벤트 루프를 막지 않습니다."""
+        async with self._flush_lock:
+            writes = self._prepare_writes()
+            if writes:
+                await asyncio.to_thread(self._write_files, writes)
+    
     def has_response_changed(self, current_response: Dict) -> bool:
         """API 응답이 변경되었는지 확인합니다."""
         try:
+            # 원본 응답 바이트가 지난번과 같으면 뉴스 내용을 다시 해시할 필요 없음
+            raw_fingerprint = current_response.get('raw_fingerprint')
+            if raw_fingerprint and None not in raw_fingerprint and raw_fingerprint == self._last_raw_fingerprint:
+                return False
+            
+            # 뉴스 ID 목록이 그대로면 새 뉴스가 없으므로 해시 없이 변경 없음으로 처리
+            # (이후 처리인 get_new_news는 ID 기준이라 기존 뉴스의 내용 수정은 영향이 없음)
+            response_ids = tuple(news.get('id') for news in current_response.get('posts', []))
+            if response_ids == self._last_response_ids:
+                self._last_raw_fingerprint = raw_fingerprint
+                return False
+            
             current_hash = self._generate_response_hash(current_response)
             last_hash = self.last_response.get('response_hash')
+            self._last_raw_fingerprint = raw_fingerprint
+            self._last_response_ids = response_ids
             
             # 해시가 다르면 응답이 변경됨
             if current_hash != last_hash:
@@ -153,7 +330,7 @@ class NewsCacheManager:
                     "response_hash": current_hash,
                     "news_count": len(current_response.get('posts', []))
                 }
-                self._save_last_response(self.last_response)
+                self._mark_dirty(last_response=True)
                 return True
             
             return False
@@ -172,6 +349,7 @@ class NewsCacheManager:
             "last_response_news_count": self.last_response.get('news_count', 0),
             "cache_files": {
                 "news_cache": self.news_cache_file,
+                "news_ids_log": self.news_ids_log_file,
                 "last_response": self.last_response_file
             }
         }
@@ -191,12 +369,22 @@ class NewsCacheManager:
                 "response_hash": None,
                 "news_count": 0
             }
+            self._news_cache_dirty = False
+            self._last_response_dirty = False
+            self._dirty_since = None
+            self._last_raw_fingerprint = None
+            self._last_response_ids = None
+            self._pending_news_ids = []
+            self._news_ids_log_lines = 0
+            self._news_ids_order = deque()
             
             # 파일 삭제
             if os.path.exists(self.news_cache_file):
                 os.remove(self.news_cache_file)
             if os.path.exists(self.last_response_file):
                 os.remove(self.last_response_file)
+            if os.path.exists(self.news_ids_log_file):
+                os.remove(self.news_ids_log_file)
             
             logger.info("캐시 초기화 완료")
             return True
@@ -206,19 +394,27 @@ class NewsCacheManager:
     
     def backup_cache(self, backup_dir: str = "cache_backup"):
         """캐시를 백업합니다."""
+        # 아직 저장하지 않은 변경까지 백업에 포함
+        self.flush()
+        return self._copy_cache_files(backup_dir)
+    
+    async def backup_cache_async(self, backup_dir: str = "cache_backup"):
+        """backup_cache와 같지만 파일 저장/복사를 스레드에서 실행해 이벤트 루프를 막지 않습니다."""
+        await self.flush_async()
+        return await asyncio.to_thread(self._copy_cache_files, backup_dir)
+    
+    def _copy_cache_files(self, backup_dir: str) -> Optional[str]:
+        """캐시 파일들을 타임스탬프 폴더로 복사하고 백업 경로를 반환합니다."""
         try:
-            import shutil
-            from datetime import datetime
-            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_path = os.path.join(backup_dir, f"cache_backup_{timestamp}")
             
             os.makedirs(backup_path, exist_ok=True)
             
-            if os.path.exists(self.news_cache_file):
-                shutil.copy2(self.news_cache_file, backup_path)
-            if os.path.exists(self.last_response_file):
-                shutil.copy2(self.last_response_file, backup_path)
+            # copyfile은 Linux/macOS에서 커널 내부 복사(sendfile/fcopyfile)를 사용
+            for cache_file in (self.news_cache_file, self.last_response_file, self.news_ids_log_file):
+                if os.path.exists(cache_file):
+                    shutil.copyfile(cache_file, os.path.join(backup_path, os.path.basename(cache_file)))
             
             logger.info(f"캐시 백업 완료: {backup_path}")
             return backup_path
@@ -244,6 +440,6 @@ class NewsCacheManager:
                 sent_set = set(sent_set or [])
                 self.news_cache["sent_summary_ids"] = sent_set
             sent_set.add(post_id)
-            self._save_news_cache()
+            self._mark_dirty(news_cache=True)
         except Exception as e:
             logger.error(f"요약 전송 ID 저장 실패: {e}")
@@ -3,67 +3,114 @@ import asyncio
 import logging
 from typing import Dict, Optional
 from datetime import datetime
-from random import random
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+# 재시도 대기 시간: 시도마다 [기본값, 기본값*2) 범위의 무작위 값 * 시도 횟수, 최대 BACKOFF_MAX_DELAY초
+BACKOFF_BASE_DELAY = 0.7
+BACKOFF_MAX_DELAY = 30.0
+
+# 이 시간(초) 안에 다시 조회하면 HTTP 요청 없이 마지막 결과를 재사용
+NASDAQ_CACHE_TTL = 30
+FEAR_GREED_CACHE_TTL = 3600  # 공포탐욕지수는 하루 한 번 갱신됨
+
 class MarketDataCollector:
     """실시간 시장 데이터 수집 클래스"""
     
-    def __init__(self):
+    def __init__(self, nasdaq_ttl: float = NASDAQ_CACHE_TTL, fear_greed_ttl: float = FEAR_GREED_CACHE_TTL,
+                 session: Optional[aiohttp.ClientSession] = None):
         self.nasdaq_url_primary = "https://query1.finance.yahoo.com/v8/finance/chart/%5EIXIC"  # NASDAQ Composite
         self.nasdaq_url_fallback = "https://query2.finance.yahoo.com/v8/finance/chart/%5EIXIC"
         self.fear_greed_url = "https://api.alternative.me/fng/"  # Fear & Greed Index
-        self.session = None
+        # 외부에서 받은 세션은 호출한 쪽이 닫음 (직접 만든 세션만 close()에서 닫음)
+        self.session = session
+        self._owns_session = session is None
+        self._timeout = aiohttp.ClientTimeout(total=10)
         # 간단한 메모리 캐시 (429 등 실패 시 사용)
         self._nasdaq_cache: Optional[Dict] = None
         self._fear_greed_cache: Optional[Dict] = None
+        # 캐시가 새 데이터로 취급되는 기한 (time.monotonic 기준)
+        self.nasdaq_ttl = nasdaq_ttl
+        self.fear_greed_ttl = fear_greed_ttl
+        self._nasdaq_expires_at = 0.0
+        self._fear_greed_expires_at = 0.0
+        # 진행 중인 종합 시장 정보 조회 (동시에 들어온 호출은 이 작업을 함께 기다림)
+        self._summary_task: Optional[asyncio.Task] = None
         # 공통 헤더 (간단한 User-Agent 추가)
         self._headers = {
             "User-Agent": "Mozilla/5.0 (compatible; StockNewsBot/1.0; +https://saveticker.com)"
         }
     
     async def __aenter__(self):
-        timeout = aiohttp.ClientTimeout(total=10)
-        self.session = aiohttp.ClientSession(timeout=timeout, headers=self._headers)
+        await self.open()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        await self.close()
+    
+    async def open(self):
+        """세션을 엽니다 (이미 열려 있거나 외부 세션을 쓰면 그대로 사용)."""
+        if self._owns_session and (self.session is None or self.session.closed):
+            # 연결/DNS 결과를 재사용해 주기마다 TCP/TLS 핸드셰이크를 반복하지 않음
+            connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(timeout=self._timeout, headers=self._headers, connector=connector)
+    
+    async def close(self):
+        """직접 만든 세션을 닫습니다."""
+        if self._owns_session and self.session:
             await self.session.close()
+            self.session = None
     
     async def _request_with_backoff(self, url: str, params: Optional[Dict] = None, max_retries: int = 3) -> Optional[Dict]:
         """백오프를 적용하여 JSON 응답을 요청합니다."""
         if not self.session:
             return None
-        delay_base = 0.7
         last_status = None
         for attempt in range(max_retries):
+            retry_after = None
             try:
-                async with self.session.get(url, params=params) as response:
+                # 외부 세션에도 같은 헤더/타임아웃이 적용되도록 요청마다 지정
+                async with self.session.get(url, params=params, headers=self._headers, timeout=self._timeout) as response:
                     last_status = response.status
                     if response.status == 200:
                         return await response.json()
                     # 429 또는 5xx는 재시도
-                    if response.status in (429, 500, 502, 503, 504):
-                        backoff = delay_base * (2 ** attempt) + random() * 0.3
-                        await asyncio.sleep(backoff)
-                        continue
-                    # 그 외 상태코드는 즉시 중단
-                    logger.error(f"요청 실패: HTTP {response.status} for {url}")
-                    return None
+                    if response.status not in (429, 500, 502, 503, 504):
+                        # 그 외 상태코드는 즉시 중단
+                        logger.error(f"요청 실패: HTTP {response.status} for {url}")
+                        return None
+                    retry_after = response.headers.get('Retry-After')
             except Exception as e:
-                # 네트워크 오류 재시도
-                backoff = delay_base * (2 ** attempt) + random() * 0.3
+                # 네트워크 오류/타임아웃 재시도
                 logger.warning(f"요청 예외 발생 (재시도 {attempt+1}/{max_retries}): {e}")
-                await asyncio.sleep(backoff)
-                continue
+            
+            # 마지막 시도 뒤에는 기다리지 않음
+            if attempt + 1 < max_retries:
+                await asyncio.sleep(self._backoff_delay(attempt, retry_after))
         if last_status:
             logger.error(f"요청 반복 실패: HTTP {last_status} for {url}")
         return None
 
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+        """재시도 전 대기 시간(초)을 계산합니다 (Retry-After 헤더가 있으면 그보다 짧게 기다리지 않음)."""
+        # 지터를 크게 주어 여러 요청이 같은 시점에 다시 몰리지 않도록 함
+        delay = random.uniform(BACKOFF_BASE_DELAY, BACKOFF_BASE_DELAY * 2) * (attempt + 1)
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                # HTTP 날짜 형식 등 숫자가 아닌 값은 무시
+                pass
+        return min(BACKOFF_MAX_DELAY, delay)
+
     async def get_nasdaq_price(self) -> Optional[Dict]:
         """나스닥 실시간 주가 정보를 가져옵니다."""
+        # TTL 안이면 요청 없이 마지막 결과 사용
+        if self._nasdaq_cache and time.monotonic() < self._nasdaq_expires_at:
+            return dict(self._nasdaq_cache)
         try:
             # 1) 기본 엔드포인트 시도
             data = await self._request_with_backoff(self.nasdaq_url_primary)
@@ -95,6 +142,7 @@ class MarketDataCollector:
                     }
                     # 캐시 갱신
                     self._nasdaq_cache = parsed
+                    self._nasdaq_expires_at = time.monotonic() + self.nasdaq_ttl
                     return parsed
             # 실패: 캐시 반환
             if self._nasdaq_cache:
@@ -112,6 +160,9 @@ class MarketDataCollector:
     
     async def get_fear_greed_index(self) -> Optional[Dict]:
         """공포탐욕지수를 가져옵니다."""
+        # TTL 안이면 요청 없이 마지막 결과 사용
+        if self._fear_greed_cache and time.monotonic() < self._fear_greed_expires_at:
+            return dict(self._fear_greed_cache)
         try:
             data = await self._request_with_backoff(self.fear_greed_url)
             if data:
@@ -138,6 +189,7 @@ class MarketDataCollector:
                         'stale': False,
                     }
                     self._fear_greed_cache = parsed
+                    self._fear_greed_expires_at = time.monotonic() + self.fear_greed_ttl
                     return parsed
             # 실패 시 캐시 사용
             if self._fear_greed_cache:
@@ -154,9 +206,37 @@ class MarketDataCollector:
         return None
     
     async def get_market_summary(self) -> Dict:
-        """종합 시장 정보를 가져옵니다."""
-        nasdaq_data = await self.get_nasdaq_price()
-        fear_greed_data = await self.get_fear_greed_index()
+        """종합 시장 정보를 가져옵니다.
+
+        조회가 이미 진행 중이면 새로 요청하지 않고 그 결과를 함께 기다립니다
+        (완료된 뒤의 호출은 각 조회 함수의 TTL 캐시를 사용).
+        """
+        task = self._summary_task
+        if task is None:
+            task = asyncio.ensure_future(self._collect_market_summary())
+            self._summary_task = task
+            task.add_done_callback(self._clear_summary_task)
+        # 한 호출자가 취소되어도 공유 작업은 계속 진행되도록 shield 사용
+        return dict(await asyncio.shield(task))
+    
+    def _clear_summary_task(self, task: asyncio.Task):
+        """완료된 종합 시장 정보 조회 작업을 정리합니다."""
+        if self._summary_task is task:
+            self._summary_task = None
+    
+    async def _collect_market_summary(self) -> Dict:
+        """나스닥 주가와 공포탐욕지수를 함께 조회합니다."""
+        # 서로 다른 호스트에 대한 독립 요청이므로 동시에 보냄
+        nasdaq_data, fear_greed_data = await asyncio.gather(
+            self.get_nasdaq_price(), self.get_fear_greed_index(), return_exceptions=True
+        )
+        # 각 조회 함수가 오류를 처리하지만, 그래도 예외가 새어 나오면 없는 데이터로 처리
+        if isinstance(nasdaq_data, Exception):
+            logger.error(f"나스닥 주가 조회 중 오류 발생: {nasdaq_data}")
+            nasdaq_data = None
+        if isinstance(fear_greed_data, Exception):
+            logger.error(f"공포탐욕지수 조회 중 오류 발생: {fear_greed_data}")
+            fear_greed_data = None
         
         return {
             'nasdaq': nasdaq_data,
@@ -1,8 +1,7 @@
 import asyncio
 import logging
-import re
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import aiohttp
 from io import BytesIO
 import discord
@@ -12,107 +11,149 @@ from .cache_manager import NewsCacheManager
 
 logger = logging.getLogger(__name__)
 
+# 여러 채널에 동시에 보내는 메시지 수 상한 (429 응답은 discord.py가 기다렸다가 재시도)
+SEND_CONCURRENCY = 3
+
 class NewsHandler:
     """뉴스 처리 및 전송을 담당하는 클래스"""
     
     def __init__(self, config, cache_manager: NewsCacheManager):
         self.config = config
         self.cache_manager = cache_manager
+        # 폴링마다 세션을 새로 만들지 않도록 API 클라이언트를 재사용
+        self._api_client = None
+        # 채널 전송 동시 실행 제한
+        self._send_semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
     
-    async def process_and_send_news(self, target_channels: List[discord.TextChannel], embed_builder, image_handler):
-        """뉴스를 처리하고 채널에 전송합니다."""
-        try:
-            async with NewsAPIClient(
+    async def get_api_client(self) -> NewsAPIClient:
+        """공유 API 클라이언트를 반환합니다 (처음 호출 시 세션을 엶)."""
+        if self._api_client is None:
+            self._api_client = NewsAPIClient(
                 self.config.API_URL,
                 self.config.NEWS_API_URL,
                 self.config.API_PAGE_SIZE, 
                 self.config.BREAKING_NEWS_KEYWORDS
-            ) as api_client:
-                data = await api_client.fetch_news()
-                if not data:
-                    return
-                
-                # (예외 우선 처리) 응답 변경 여부와 무관하게 요약형 커뮤니티 포스트는 즉시 전송 시도
-                try:
-                    all_posts = api_client.get_news_list(data)
-                    summary_candidates = [p for p in all_posts if p.get('_source_api') == 'community' and self._is_summary_style_post(p)]
-                    for post in summary_candidates:
-                        post_id = post.get('id')
-                        if post_id and self.cache_manager.has_sent_summary(post_id):
-                            continue
-                        title = post.get('title', '제목 없음')
-                        url = api_client.format_news_url(post.get('id', ''), post.get('_source_api', 'community'))
-                        # 임베드로 전송
-                        embed = discord.Embed(
-                            title="🧾 커뮤니티 요약",
-                            description=title,
-                            color=0x00bfff,
-                            timestamp=datetime.now()
-                        )
-                        embed.add_field(name="🔗 상세 보기", value=f"[링크]({url})", inline=False)
-                        for channel in target_channels:
-                            try:
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(0.3)
-                            except Exception as e:
-                                logger.error(f"요약형 커뮤니티 포스트 전송 실패: {e}")
-                        if post_id:
-                            self.cache_manager.mark_sent_summary(post_id)
-                except Exception as e:
-                    logger.warning(f"요약형 포스트 선전송 처리 중 경고: {e}")
+            )
+        await self._api_client.open()
+        return self._api_client
+    
+    async def close(self):
+        """공유 API 클라이언트의 세션을 닫고 저장하지 않은 캐시를 기록합니다."""
+        if self._api_client:
+            await self._api_client.close()
+        await self.cache_manager.flush_async()
+    
+    async def process_and_send_news(self, target_channels: List[discord.TextChannel], embed_builder, image_handler):
+        """뉴스를 처리하고 채널에 전송합니다."""
+        try:
+            api_client = await self.get_api_client()
+            data = await api_client.fetch_news()
+            if not data:
+                return
+            
+            # (예외 우선 처리) 응답 변경 여부와 무관하게 요약형 커뮤니티 포스트는 즉시 전송 시도
+            try:
+                all_posts = api_client.get_news_list(data)
+                # 요약형 여부는 여기서 한 번만 판단해 news['_is_summary']에 저장 (아래 새 뉴스 처리에서 재사용)
+                for post in all_posts:
+                    post['_is_summary'] = post.get('_source_api') == 'community' and self._is_summary_style_post(post)
+                for post in all_posts:
+                    if post['_is_summary']:
+                        await self._send_summary_post(post, target_channels, api_client)
+            except Exception as e:
+                logger.warning(f"요약형 포스트 선전송 처리 중 경고: {e}")
 
-                # API 응답이 변경되었는지 확인
-                if not self.cache_manager.has_response_changed(data):
-                    logger.info("API 응답에 변경사항이 없습니다.")
-                    return
-                
-                # 새로운 뉴스만 필터링 (파일 기반 캐시 사용)
-                new_news = self.cache_manager.get_new_news(data)
-                
-                # NEWS_API_URL 뉴스만 즉시 전송, Community 뉴스는 리포트용으로 제외
-                news_api_news = [news for news in new_news if news.get('_source_api') == 'news']
-                
-                if news_api_news:
-                    logger.info(f"{len(news_api_news)}개의 새로운 공식 뉴스를 {len(target_channels)}개 채널에 전송합니다.")
-                    for channel in target_channels:
-                        await self._send_news_to_channel(channel, news_api_news, api_client, embed_builder, image_handler)
-                
-                # Community 뉴스는 로그만 남기고 리포트에서 처리
-                community_news = [news for news in new_news if news.get('_source_api') == 'community']
-                if community_news:
-                    logger.info(f"{len(community_news)}개의 Community 뉴스는 리포트에서 처리됩니다.")
+            # API 응답이 변경되었는지 확인
+            if not self.cache_manager.has_response_changed(data):
+                logger.info("API 응답에 변경사항이 없습니다.")
+                return
+            
+            # 새로운 뉴스만 필터링 (파일 기반 캐시 사용)
+            new_news = self.cache_manager.get_new_news(data)
+            
+            # NEWS_API_URL 뉴스만 즉시 전송, Community 뉴스는 리포트용으로 제외
+            # 출처별 목록을 한 번의 순회로 나눔
+            news_api_news, community_news = [], []
+            for news in new_news:
+                source_api = news.get('_source_api')
+                if source_api == 'news':
+                    news_api_news.append(news)
+                elif source_api == 'community':
+                    community_news.append(news)
+            
+            if news_api_news:
+                logger.info(f"{len(news_api_news)}개의 새로운 공식 뉴스를 {len(target_channels)}개 채널에 전송합니다.")
+                # 분류/메시지 문구는 채널 수와 무관하게 뉴스마다 한 번만 계산
+                prepared_news = self._prepare_news_for_send(news_api_news, api_client, embed_builder)
+                # 채널 안에서는 순서대로, 채널끼리는 동시에 전송
+                await asyncio.gather(*(
+                    self._send_news_to_channel(channel, prepared_news, api_client, embed_builder, image_handler)
+                    for channel in target_channels
+                ))
+            
+            # Community 뉴스는 로그만 남기고 리포트에서 처리
+            if community_news:
+                logger.info(f"{len(community_news)}개의 Community 뉴스는 리포트에서 처리됩니다.")
 
-                    # 예외: '장전/장마감/장중 뉴스 한줄 요약(모음)' 스타일은 즉시 텍스트 메시지로 전송
-                    summary_posts = [n for n in community_news if self._is_summary_style_post(n)]
-                    if summary_posts:
-                        logger.info(f"요약형 커뮤니티 포스트 {len(summary_posts)}개를 즉시 메시지로 전송합니다.")
-                        for post in summary_posts:
-                            post_id = post.get('id')
-                            if post_id and self.cache_manager.has_sent_summary(post_id):
-                                continue
-                            title = post.get('title', '제목 없음')
-                            url = api_client.format_news_url(post.get('id', ''), post.get('_source_api', 'community'))
-                            embed = discord.Embed(
-                                title="🧾 커뮤니티 요약",
-                                description=title,
-                                color=0x00bfff,
-                                timestamp=datetime.now()
-                            )
-                            embed.add_field(name="🔗 상세 보기", value=f"[링크]({url})", inline=False)
-                            for channel in target_channels:
-                                try:
-                                    await channel.send(embed=embed)
-                                    await asyncio.sleep(0.5)
-                                except Exception as e:
-                                    logger.error(f"요약형 커뮤니티 포스트 전송 실패: {e}")
-                            if post_id:
-                                self.cache_manager.mark_sent_summary(post_id)
-                
+                # 예외: '장전/장마감/장중 뉴스 한줄 요약(모음)' 스타일은 즉시 텍스트 메시지로 전송
+                summary_posts = [n for n in community_news if n.get('_is_summary')]
+                if summary_posts:
+                    logger.info(f"요약형 커뮤니티 포스트 {len(summary_posts)}개를 즉시 메시지로 전송합니다.")
+                    for post in summary_posts:
+                        await self._send_summary_post(post, target_channels, api_client)
+            
         except Exception as e:
             logger.error(f"뉴스 체크 중 오류 발생: {e}")
+        finally:
+            # 폴링마다 모아 둔 캐시 변경을 (간격이 지났으면) 파일에 저장
+            await self.cache_manager.maybe_flush()
+    
+    async def _send_summary_post(self, post: Dict, target_channels: List[discord.TextChannel], api_client: NewsAPIClient):
+        """요약형 커뮤니티 포스트를 임베드로 모든 채널에 보냅니다 (이미 보낸 포스트는 건너뜀)."""
+        post_id = post.get('id')
+        if post_id and self.cache_manager.has_sent_summary(post_id):
+            return
+        url = api_client.format_news_url(post.get('id', ''), post.get('_source_api', 'community'))
+        # 임베드는 포스트당 한 번만 만들고 모든 채널에 같은 객체를 보냄
+        embed = self._make_summary_embed(post.get('title', '제목 없음'), url)
+        await self._broadcast_embed(target_channels, embed)
+        if post_id:
+            self.cache_manager.mark_sent_summary(post_id)
+    
+    @staticmethod
+    def _make_summary_embed(title: str, url: str) -> discord.Embed:
+        """요약형 커뮤니티 포스트용 임베드를 생성합니다."""
+        embed = discord.Embed(
+            title="🧾 커뮤니티 요약",
+            description=title,
+            color=0x00bfff,
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="🔗 상세 보기", value=f"[링크]({url})", inline=False)
+        return embed
+    
+    async def _send(self, channel, **kwargs):
+        """동시 전송 수 제한 안에서 채널에 메시지를 보냅니다.
+
+        핀 고정/이미지 첨부처럼 channel.send를 거치지 않는 디스코드 호출은
+        호출하는 쪽에서 self._send_semaphore를 직접 잡습니다.
+        """
+        async with self._send_semaphore:
+            return await channel.send(**kwargs)
+    
+    async def _broadcast_embed(self, target_channels: List[discord.TextChannel], embed: discord.Embed):
+        """임베드를 모든 채널에 동시에 보냅니다 (채널별 실패는 로그만 남김)."""
+        async def send_one(channel):
+            try:
+                await self._send(channel, embed=embed)
+            except Exception as e:
+                logger.error(f"요약형 커뮤니티 포스트 전송 실패: {e}")
+        
+        await asyncio.gather(*(send_one(channel) for channel in target_channels))
     
-    async def _send_news_to_channel(self, channel, news_list: List[Dict], api_client: NewsAPIClient, embed_builder, image_handler):
-        """뉴스 리스트를 디스코드 채널에 전송합니다. (NEWS_API_URL 뉴스만 처리)"""
+    def _prepare_news_for_send(self, news_list: List[Dict], api_client: NewsAPIClient, embed_builder) -> List[Tuple[Dict, str, bool, bool, str]]:
+        """뉴스마다 (뉴스, 분류, 속보 여부, 중요 여부, 메시지 문구)를 미리 계산합니다 (실패한 뉴스는 제외)."""
+        prepared = []
         for news in news_list:
             try:
                 # NEWS_API_URL 뉴스만 처리 (이미 필터링되어 들어옴)
@@ -121,9 +162,6 @@ class NewsHandler:
                 from_news_api = True  # 이미 NEWS_API_URL 뉴스만 들어옴
                 is_important = api_client.is_important_news(news, self.config.IMPORTANT_LIKE_THRESHOLD, from_news_api)
                 
-                # 임베드 생성 (썸네일 허용)
-                embed = await embed_builder.create_news_embed(news, api_client, news_type, is_breaking, is_important, allow_thumbnail=True)
-                
                 # 메시지 전송 - 이모지와 정리된 헤드라인 포함
                 clean_title = embed_builder._clean_news_title(news.get('title', '제목 없음'))
                 
@@ -135,54 +173,50 @@ class NewsHandler:
                 else:
                     message_content = f"📈 {clean_title}"
                 
+                prepared.append((news, news_type, is_breaking, is_important, message_content))
+            except Exception as e:
+                logger.error(f"뉴스 전송 준비 중 오류 발생: {e}")
+        return prepared
+    
+    async def _send_news_to_channel(self, channel, prepared_news: List[Tuple[Dict, str, bool, bool, str]], api_client: NewsAPIClient, embed_builder, image_handler):
+        """_prepare_news_for_send로 준비한 뉴스들을 디스코드 채널에 전송합니다. (NEWS_API_URL 뉴스만 처리)"""
+        for news, news_type, is_breaking, is_important, message_content in prepared_news:
+            try:
+                # 임베드 생성 (썸네일 허용) - 재시도 시 채널별로 수정하므로 채널마다 따로 만듦
+                embed = await embed_builder.create_news_embed(news, api_client, news_type, is_breaking, is_important, allow_thumbnail=True)
+                
                 try:
-                    message = await channel.send(content=message_content, embed=embed)
+                    message = await self._send(channel, content=message_content, embed=embed)
                 except Exception as send_err:
-                    # 썸네일 URL 문제가 의심되면 썸네일 없이 재시도
+                    # 썸네일 URL 문제가 의심되면 썸네일 없이 재시도 (임베드를 다시 만들지 않고 썸네일만 제거)
                     logger.warning(f"메시지 전송 실패, 썸네일 제거 후 재시도: {send_err}")
-                    embed_no_thumb = await embed_builder.create_news_embed(
-                        news, api_client, news_type, is_breaking, is_important, allow_thumbnail=False
-                    )
-                    message = await channel.send(content=message_content, embed=embed_no_thumb)
+                    embed.set_thumbnail(url=None)
+                    message = await self._send(channel, content=message_content, embed=embed)
                 
-                # 속보이거나 중요 뉴스인 경우 핀 고정
+                # 속보이거나 중요 뉴스인 경우 핀 고정 (디스코드 호출이므로 전송과 같은 동시 실행 제한 적용)
                 if is_breaking or is_important:
                     try:
-                        await message.pin()
+                        async with self._send_semaphore:
+                            await message.pin()
                         logger.info(f"{news_type} 뉴스 핀 고정: {news.get('title', 'Unknown')}")
                     except discord.Forbidden:
                         logger.warning("메시지 핀 고정 권한이 없습니다.")
                 
-                # 이미지가 있으면 첨부
+                # 이미지가 있으면 첨부 (다운로드와 업로드 모두 전송 동시 실행 제한 안에서 수행)
                 thumbnail_url = news.get('thumbnail')
                 if thumbnail_url:
-                    await image_handler.send_image_attachment(channel, thumbnail_url, news.get('title', 'News Image'))
-                
-                # 잠시 대기 (API 제한 방지)
-                await asyncio.sleep(1)
+                    async with self._send_semaphore:
+                        await image_handler.send_image_attachment(channel, thumbnail_url, news.get('title', 'News Image'))
                 
             except Exception as e:
                 logger.error(f"뉴스 전송 중 오류 발생: {e}")
 
     def _is_summary_style_post(self, news: Dict) -> bool:
         """커뮤니티 요약형 포스트인지 판단합니다 (예: 장전 뉴스 한줄 요약 모음)."""
-        title = (news.get('title') or '').strip()
-        if not title:
-            return False
-        # 간단 규칙: 제목에 '요약'이 포함되면 요약형으로 간주
-        if '요약' in title:
-            return True
-        # 대표 패턴들: 장전/장마감/장중 + (뉴스)? + 한줄 요약( 모음)
-        patterns = [
-            r"장전\s*뉴스?.*한[\s]*줄\s*요약(\s*모음)?",
-            r"장마감\s*뉴스?.*한[\s]*줄\s*요약(\s*모음)?",
-            r"장중\s*뉴스?.*한[\s]*줄\s*요약(\s*모음)?",
-            r"한[\s]*줄\s*요약\s*모음",
-        ]
-        for pattern in patterns:
-            if re.search(pattern, title, re.IGNORECASE):
-                return True
-        return False
+        # 제목에 '요약'이 포함되면 요약형으로 간주
+        # (장전/장마감/장중 뉴스 한줄 요약(모음) 같은 대표 패턴도 모두 '요약'을 포함하므로 별도 정규식 검사가 필요 없음)
+        title = news.get('title') or ''
+        return '요약' in title
     
     async def get_manual_news(self, api_client: NewsAPIClient, embed_builder, count: int = 3) -> List[Dict]:
         """수동 뉴스 체크를 위한 뉴스 데이터를 가져옵니다."""